@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Endpoint load test: RPS and p50/p95/p99 per endpoint under realistic mixes.
+
+Usage:
+    python benchmarks/bench_endpoints.py [--mix launch|launch_batch|polling|completion|all]
+                                         [--concurrency 16] [--duration 10] [--warmup 2]
+                                         [--db sqlite|mysql|fallback] [--sqlite PATH]
+                                         [--url http://127.0.0.1:8000]
+                                         [--json results.json] [--compare baseline.json]
+
+By default the app runs in-process (Flask test clients, one per worker
+thread) against the embedded sqlite stand-in, seeded through seed_data.py
+on first use. ``--db mysql`` uses the DB_* environment like main.py does
+(point it at a local MySQL seeded with seed_data.py), ``--db fallback``
+makes every connection attempt fail so FALLBACK_DATA and the breaker are
+measured. ``--url`` drives an already running server (e.g. gunicorn) over
+HTTP keep-alive instead; the server then uses its own database settings.
+
+Mixes:
+    launch        app start: dashboard, overview, assigned tickets, week view
+    launch_batch  the five launch screens in a single /batch request
+    polling       background notification polling
+    completion    technicians closing tickets: status updates, parts, re-reads
+
+Results are written as JSON so runs can be compared across commits with
+--compare.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# (name, method, path, weight, body); {ticket} is filled per request
+MIXES = {
+    'launch': [
+        ('dashboard', 'GET', '/dashboard/', 30, None),
+        ('dashboard_overview', 'GET', '/dashboard/overview', 15, None),
+        ('tickets_assigned', 'GET', '/tickets/assigned?limit=20', 25, None),
+        ('tickets_assigned_sparse', 'GET', '/tickets/assigned?limit=20&fields=id,ticket_number,status,scheduled_date', 10, None),
+        ('schedule_week', 'GET', '/schedule/week', 10, None),
+        ('notifications_unread_count', 'GET', '/notifications/unread-count', 10, None),
+    ],
+    # the five app-launch screens as one /batch round trip
+    'launch_batch': [
+        ('batch_launch', 'POST', '/batch', 1, {"requests": [
+            {"path": "/dashboard/"}, {"path": "/dashboard/overview"}, {"path": "/notifications/unread-count"},
+            {"path": "/schedule/"}, {"path": "/profile/"}
+        ]}),
+    ],
+    'polling': [
+        ('notifications_unread_count', 'GET', '/notifications/unread-count', 60, None),
+        ('notifications', 'GET', '/notifications/?limit=20', 30, None),
+        ('notifications_unread_only', 'GET', '/notifications/?unread_only=true', 10, None),
+    ],
+    'completion': [
+        ('ticket_status_in_progress', 'PUT', '/tickets/{ticket}/status', 20,
+         {"status": "IN_PROGRESS", "notes": "Started work"}),
+        ('ticket_status_completed', 'PUT', '/tickets/{ticket}/status', 25,
+         {"status": "COMPLETED", "notes": "Replaced bearing", "work_performed": "Bearing replacement",
+          "parts_used": [{"part_id": 1, "quantity": 1}]}),
+        ('ticket_parts', 'POST', '/tickets/{ticket}/parts', 15,
+         {"parts": [{"part_id": 1, "name": "Motor Bearing", "quantity": 1, "cost": 250.0}]}),
+        ('tickets_in_progress', 'GET', '/tickets/assigned?status=IN_PROGRESS', 20, None),
+        ('tickets_completed', 'GET', '/tickets/completed', 10, None),
+        ('ticket_detail', 'GET', '/tickets/{ticket}', 10, None),
+        ('dashboard', 'GET', '/dashboard/', 10, None),
+    ],
+}
+SEED_VOLUMES = ['--technicians', '200', '--tickets', '50000', '--notifications', '50000', '--parts', '5000']
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    """``samples`` is a list of (latency_seconds, status_code)."""
+    latencies = sorted(latency * 1000 for latency, _ in samples)
+    statuses = defaultdict(int)
+    for _, status in samples:
+        statuses[str(status)] += 1
+    return {
+        "requests": len(samples),
+        "errors": sum(count for status, count in statuses.items() if not status.startswith(('2', '3'))),
+        "rps": round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "max_ms": round(latencies[-1], 3) if latencies else 0.0,
+        "statuses": dict(statuses),
+    }
+
+
+# ==================== TARGETS ====================
+def prepare_sqlite(path, reseed):
+    import seed_data
+    if reseed or not os.path.exists(path):
+        print(f"Seeding sqlite stand-in at {path}")
+        seed_data.main(['--sqlite', path, '--create-schema', '--truncate', *SEED_VOLUMES])
+    return path
+
+
+def load_app(args):
+    """Import main with the requested database behind get_db_connection()."""
+    if args.db == 'sqlite':
+        path = prepare_sqlite(args.sqlite, args.reseed)
+    import main
+    import pymysql
+    import fakedb
+    if args.db == 'sqlite':
+        main.connection_pool._connect = lambda **_config: fakedb.connect(path)
+    elif args.db == 'fallback':
+        def unreachable(**_config):
+            raise pymysql.err.OperationalError(2003, "Can't connect to MySQL server (benchmark fallback mode)")
+        main.connection_pool._connect = unreachable
+    return main
+
+
+def ticket_ids(main, technician_ids):
+    """A few real ticket ids per technician so writes hit existing rows."""
+    ids = {}
+    for technician_id in technician_ids:
+        tickets = main.get_technician_tickets(technician_id, fields=["id"])
+        ids[technician_id] = [t["id"] for t in tickets[:50]] or [1]
+    return ids
+
+
+class InProcessClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, headers, body):
+        response = self.client.open(path, method=method, headers=headers, json=body)
+        response.get_data()
+        return response.status_code
+
+
+class HTTPClient:
+    def __init__(self, base_url):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.connection = http.client.HTTPConnection(parsed.hostname, parsed.port or 80, timeout=30)
+
+    def request(self, method, path, headers, body):
+        payload = json.dumps(body) if body is not None else None
+        if payload is not None:
+            headers = dict(headers, **{'Content-Type': 'application/json'})
+        try:
+            self.connection.request(method, path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            # reconnect on the next request instead of reusing a broken socket
+            self.connection.close()
+            raise
+        return response.status
+
+
+# ==================== LOAD ====================
+def run_mix(mix, make_client, tokens, tickets, args):
+    operations = MIXES[mix]
+    technician_ids = list(tokens)
+    weights = [operation[3] for operation in operations]
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(args.concurrency + 1)
+    state = {}
+
+    def worker(index):
+        rng = random.Random(f"{args.seed}:{mix}:{index}")
+        client = make_client()
+        local = defaultdict(list)
+        start_barrier.wait()
+        while time.perf_counter() < state["stop"]:
+            name, method, path, _, body = rng.choices(operations, weights)[0]
+            technician_id = rng.choice(technician_ids)
+            path = path.replace('{ticket}', str(rng.choice(tickets[technician_id])))
+            headers = {'Authorization': f"Bearer {tokens[technician_id]}"}
+            started = time.perf_counter()
+            try:
+                status = client.request(method, path, headers, body)
+            except Exception as e:
+                status = type(e).__name__
+            if started >= state["measure_from"]:
+                local[name].append((time.perf_counter() - started, status))
+        with lock:
+            for name, values in local.items():
+                samples[name].extend(values)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    state["measure_from"] = time.perf_counter() + args.warmup
+    state["stop"] = state["measure_from"] + args.duration
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+
+    endpoints = {name: summarize(values, args.duration) for name, values in sorted(samples.items())}
+    overall = summarize([sample for values in samples.values() for sample in values], args.duration)
+    return {"overall": overall, "endpoints": endpoints}
+
+
+def print_mix(mix, result):
+    overall = result["overall"]
+    print(f"\n{mix}: {overall['rps']:.1f} req/s, p50 {overall['p50_ms']:.2f} ms, "
+          f"p95 {overall['p95_ms']:.2f} ms, p99 {overall['p99_ms']:.2f} ms, {overall['errors']} errors")
+    print(f"  {'endpoint':<32} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for name, entry in result["endpoints"].items():
+        print(f"  {name:<32} {entry['rps']:8.1f} {entry['p50_ms']:8.2f} {entry['p95_ms']:8.2f} "
+              f"{entry['p99_ms']:8.2f} {entry['errors']:7d}")
+
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} (commit {baseline.get('commit', '?')}):")
+    for mix, result in results["mixes"].items():
+        before = baseline.get("mixes", {}).get(mix)
+        if not before:
+            continue
+        for name, entry in [("overall", result["overall"])] + list(result["endpoints"].items()):
+            old = before["overall"] if name == "overall" else before["endpoints"].get(name)
+            if not old or not old["rps"]:
+                continue
+            rps_change = 100.0 * (entry["rps"] - old["rps"]) / old["rps"]
+            p99_change = 100.0 * (entry["p99_ms"] - old["p99_ms"]) / old["p99_ms"] if old["p99_ms"] else 0.0
+            print(f"  {mix}/{name:<32} req/s {rps_change:+6.1f}%  p99 {p99_change:+6.1f}%")
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--mix', choices=list(MIXES) + ['all'], default='all')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help='measured seconds per mix')
+    parser.add_argument('--warmup', type=float, default=2.0, help='unmeasured seconds before each mix')
+    parser.add_argument('--technicians', type=int, default=50, help='distinct technicians (tokens) to spread load over')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--db', choices=['sqlite', 'mysql', 'fallback'], default='sqlite')
+    parser.add_argument('--sqlite', default=os.path.join(tempfile.gettempdir(), 'ostrich_bench.db'))
+    parser.add_argument('--reseed', action='store_true', help='regenerate the sqlite data set')
+    parser.add_argument('--url', help='drive a running server over HTTP instead of in-process')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--compare', help='print changes against a previous --json result')
+    args = parser.parse_args()
+
+    app_module = load_app(args)
+    technician_ids = list(range(1, args.technicians + 1))
+    tokens = {i: app_module.create_access_token({'sub': str(i)}) for i in technician_ids}
+    tickets = ticket_ids(app_module, technician_ids)
+    if args.url:
+        make_client = lambda: HTTPClient(args.url)
+        target = args.url
+    else:
+        make_client = lambda: InProcessClient(app_module.app)
+        target = f"in-process ({args.db})"
+
+    mixes = list(MIXES) if args.mix == 'all' else [args.mix]
+    print(f"Target {target}, concurrency {args.concurrency}, {args.duration:.0f}s per mix after {args.warmup:.0f}s warm-up")
+    results = {
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "target": target,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "technicians": args.technicians,
+        "mixes": {}
+    }
+    for mix in mixes:
+        results["mixes"][mix] = run_mix(mix, make_client, tokens, tickets, args)
+        print_mix(mix, results["mixes"][mix])
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: per-cell isoformat loop vs. RowSerializer column plan.
+
+Usage: python benchmarks/bench_serializer.py [rows] [repeats]
+"""
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymysql.constants import FIELD_TYPE
+
+from serializers import RowSerializer
+
+# Shape of `SELECT st.*, c.name ...` on service_tickets plus a DECIMAL cost column
+DESCRIPTION = (
+    ('id', FIELD_TYPE.LONG),
+    ('ticket_number', FIELD_TYPE.VAR_STRING),
+    ('customer_name', FIELD_TYPE.VAR_STRING),
+    ('customer_phone', FIELD_TYPE.VAR_STRING),
+    ('customer_address', FIELD_TYPE.BLOB),
+    ('product_name', FIELD_TYPE.VAR_STRING),
+    ('product_model', FIELD_TYPE.VAR_STRING),
+    ('issue_description', FIELD_TYPE.BLOB),
+    ('status', FIELD_TYPE.STRING),
+    ('priority', FIELD_TYPE.STRING),
+    ('assigned_staff_id', FIELD_TYPE.LONG),
+    ('scheduled_date', FIELD_TYPE.DATETIME),
+    ('completed_at', FIELD_TYPE.DATETIME),
+    ('created_at', FIELD_TYPE.TIMESTAMP),
+    ('estimated_cost', FIELD_TYPE.NEWDECIMAL),
+)
+COLUMNS = [column[0] for column in DESCRIPTION]
+
+
+def make_rows(count):
+    base = datetime(2025, 1, 1, 9, 0)
+    return [
+        (
+            i, f"TKT{i:06d}", "John Customer", "9876543210", "123 Main St, Mumbai",
+            "3HP Motor", "OST-3HP-SP", "Motor not starting properly", "SCHEDULED", "HIGH",
+            1 + i % 50, base + timedelta(hours=i), None, base, Decimal("250.00"),
+        )
+        for i in range(count)
+    ]
+
+
+def legacy(rows):
+    # What DictCursor + the old per-cell loop in main.py did (Decimal left as-is)
+    results = [dict(zip(COLUMNS, row)) for row in rows]
+    for result in results:
+        for key, value in result.items():
+            if hasattr(value, 'isoformat'):
+                result[key] = value.isoformat()
+    return results
+
+
+def planned_dicts(rows):
+    return RowSerializer(DESCRIPTION).dicts(rows)
+
+
+def planned_tuples(rows):
+    return RowSerializer(DESCRIPTION).tuples(rows)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    rows = make_rows(count)
+
+    print(f"{count} rows x {len(DESCRIPTION)} columns, best of {repeats}")
+    baseline = None
+    for name, fn in (("legacy isoformat loop", legacy),
+                     ("RowSerializer.dicts", planned_dicts),
+                     ("RowSerializer.tuples", planned_tuples)):
+        best = min(timeit.repeat(lambda: fn(rows), number=1, repeat=repeats))
+        baseline = baseline or best
+        print(f"  {name:<24} {best * 1000:8.2f} ms  ({baseline / best:4.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
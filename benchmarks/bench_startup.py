@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Cold-start benchmark: import time of main.py and time to first response.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--server gunicorn|dev]
+                                       [--max-import-ms N] [--max-first-response-ms N]
+                                       [--json results.json]
+
+Import time comes from ``python -X importtime -c "import main"``; time to
+first response spawns the server on a free port and polls /health. Exits
+non-zero when a --max-* budget is exceeded so CI can catch regressions.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def child_env(**extra):
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1', **extra)
+    env.pop('FLASK_ENV', None)
+    return env
+
+
+def measure_import():
+    """Return (total_ms, [(module, self_ms, cumulative_ms)]) for ``import main``."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import main'],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True
+    )
+    modules = []
+    total = None
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name.rstrip()
+        modules.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000))
+        if name.strip() == 'main' and not name.startswith(' ' * 3):
+            total = int(cumulative_us) / 1000
+    return total, modules
+
+
+def get(url, timeout=5.0):
+    started = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        response.read()
+    return (time.perf_counter() - started) * 1000
+
+
+def measure_first_response(server):
+    """Spawn the server and time /health, then the first /swagger.json."""
+    port = free_port()
+    env = child_env(PORT=str(port), WEB_CONCURRENCY='1')
+    if server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'main:app']
+    else:
+        command = [sys.executable, 'main.py', '--dev']
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f"http://127.0.0.1:{port}"
+    try:
+        deadline = started + 30
+        while True:
+            try:
+                get(base + '/health', timeout=1)
+                break
+            except (urllib.error.URLError, ConnectionError, OSError):
+                if time.perf_counter() > deadline or process.poll() is not None:
+                    raise RuntimeError(f"{server} server did not answer /health")
+                time.sleep(0.005)
+        first_response = (time.perf_counter() - started) * 1000
+        first_spec = get(base + '/swagger.json')
+        second_spec = get(base + '/swagger.json')
+        return {
+            "first_response_ms": round(first_response, 1),
+            "first_swagger_json_ms": round(first_spec, 1),
+            "cached_swagger_json_ms": round(second_spec, 1)
+        }
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--server', choices=['gunicorn', 'dev'], default='gunicorn')
+    parser.add_argument('--top', type=int, default=10, help='slowest modules to list')
+    parser.add_argument('--max-import-ms', type=float)
+    parser.add_argument('--max-first-response-ms', type=float)
+    parser.add_argument('--json', help='write results to this file')
+    args = parser.parse_args()
+
+    import_totals = []
+    modules = []
+    for _ in range(args.runs):
+        total, modules = measure_import()
+        import_totals.append(total)
+    import_ms = statistics.median(import_totals)
+
+    print(f"import main: median {import_ms:.1f} ms over {args.runs} runs")
+    for name, self_ms, cumulative_ms in sorted(modules, key=lambda m: -m[1])[:args.top]:
+        print(f"  {name:<40} self {self_ms:7.1f} ms  cumulative {cumulative_ms:7.1f} ms")
+
+    runs = [measure_first_response(args.server) for _ in range(args.runs)]
+    startup = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    print(f"{args.server}: time to first response {startup['first_response_ms']:.1f} ms, "
+          f"first swagger.json {startup['first_swagger_json_ms']:.1f} ms, "
+          f"cached {startup['cached_swagger_json_ms']:.1f} ms")
+
+    results = {
+        "python": sys.version.split()[0],
+        "server": args.server,
+        "runs": args.runs,
+        "import_ms": round(import_ms, 1),
+        "slowest_modules": [
+            {"module": name, "self_ms": round(self_ms, 2), "cumulative_ms": round(cumulative_ms, 2)}
+            for name, self_ms, cumulative_ms in sorted(modules, key=lambda m: -m[1])[:args.top]
+        ],
+        **startup
+    }
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    failed = False
+    if args.max_import_ms is not None and import_ms > args.max_import_ms:
+        print(f"FAIL: import time {import_ms:.1f} ms exceeds budget {args.max_import_ms} ms")
+        failed = True
+    if args.max_first_response_ms is not None and startup['first_response_ms'] > args.max_first_response_ms:
+        print(f"FAIL: first response {startup['first_response_ms']:.1f} ms exceeds budget {args.max_first_response_ms} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
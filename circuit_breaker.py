@@ -0,0 +1,185 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker guarding calls to a flaky dependency.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    :meth:`allow` returns ``False`` without touching the dependency. Once
+    ``reset_timeout`` seconds have passed it goes half-open and lets up to
+    ``half_open_max_calls`` trial calls through; a success closes it again,
+    a failure re-opens it. Callbacks registered with :meth:`on_close` run
+    (on the recording thread) whenever the circuit closes after being open.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, half_open_max_calls=1, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._listeners = []
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def on_close(self, callback):
+        self._listeners.append(callback)
+        return callback
+
+    def allow(self):
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = self.HALF_OPEN
+                self._half_open_calls = 0
+            if self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self):
+        """Give back a half-open trial slot when a call ended without an outcome."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self):
+        with self._lock:
+            recovered = self._state != self.CLOSED
+            self._state = self.CLOSED
+            self._failures = 0
+        if recovered:
+            print("Database circuit closed")
+            for callback in self._listeners:
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Circuit close callback failed: {e}")
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or (
+                    self._state == self.CLOSED and self._failures >= self.failure_threshold):
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self.opened += 1
+                failures = self._failures
+            else:
+                return
+        print(f"Database circuit opened after {failures} consecutive failures")
+
+    def stats(self):
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "times_opened": self.opened,
+                "rejected_calls": self.rejected
+            }
+
+
+def _cells(value):
+    """Approximate size of a cached result: rows x columns for row lists, keys for a row."""
+    if isinstance(value, list):
+        return max(1, sum(len(row) if isinstance(row, dict) else 1 for row in value))
+    if isinstance(value, dict):
+        return max(1, len(value))
+    return 1
+
+
+class StaleCache:
+    """Bounded LRU of the last good result per key, for serving during outages.
+
+    Bounded both by entry count and by ``max_cells``, the total number of
+    row fields held, since one entry can be a technician's whole ticket
+    list. A result larger than ``max_cells`` on its own is not kept.
+
+    Entries remember how to refresh themselves; :meth:`refresh_served`
+    re-runs the refreshers of every key that was served stale since the
+    last refresh (typically once the circuit closes again).
+    """
+
+    def __init__(self, max_entries=10000, max_cells=500000, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_cells = max_cells
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._cells = 0
+        self._served = set()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, key, value, refresh=None):
+        cells = _cells(value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._cells -= previous[3]
+            if cells > self.max_cells:
+                return value
+            self._entries[key] = (value, self._clock(), refresh, cells)
+            self._cells += cells
+            while len(self._entries) > self.max_entries or self._cells > self.max_cells:
+                _, evicted = self._entries.popitem(last=False)
+                self._cells -= evicted[3]
+        return value
+
+    def get(self, key):
+        """Return ``(value, age_seconds)`` for ``key``, or ``None``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._served.add(key)
+            value, stored_at = entry[0], entry[1]
+            return value, self._clock() - stored_at
+
+    def refresh_served(self):
+        with self._lock:
+            keys, self._served = self._served, set()
+            refreshers = [self._entries[key][2] for key in keys if key in self._entries]
+        for refresh in refreshers:
+            if refresh is None:
+                continue
+            try:
+                refresh()
+            except Exception as e:
+                print(f"Stale cache refresh failed: {e}")
+        return len(refreshers)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "cells": self._cells,
+                "served_stale_pending_refresh": len(self._served),
+                "hits": self.hits,
+                "misses": self.misses
+            }
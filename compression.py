@@ -0,0 +1,232 @@
+import threading
+import time
+import zlib
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/javascript',
+})
+
+
+class _GzipEncoder:
+    def __init__(self, level):
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self, level):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._obj.process(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class _ZstdEncoder:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._obj.flush()
+
+
+def available_encodings():
+    """Encodings this process can produce, in server preference order."""
+    encodings = []
+    if zstandard is not None:
+        encodings.append('zstd')
+    if brotli is not None:
+        encodings.append('br')
+    encodings.append('gzip')
+    return encodings
+
+
+def parse_accept_encoding(header):
+    """Return ``{coding: q}`` for an Accept-Encoding header value."""
+    accepted = {}
+    for item in (header or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def negotiate(header, encodings):
+    """Pick the best encoding from ``encodings`` for the client, or ``None``."""
+    accepted = parse_accept_encoding(header)
+    if not accepted:
+        return None
+    wildcard = accepted.get('*', 0.0)
+    best, best_q = None, 0.0
+    for coding in encodings:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class Compressor:
+    """Negotiated response compression for a Flask app.
+
+    Bodies smaller than ``COMPRESS_MIN_SIZE`` are sent as-is; streamed
+    responses are compressed chunk by chunk and flushed after each one.
+    Per-endpoint bytes saved and CPU time spent are kept in :meth:`stats`.
+    """
+
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self._stats = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BR_LEVEL', 4)
+        app.config.setdefault('COMPRESS_ZSTD_LEVEL', 3)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+        app.config.setdefault('COMPRESS_MIMETYPES', COMPRESSIBLE_MIMETYPES)
+        app.config.setdefault('COMPRESS_ENCODINGS', available_encodings())
+        self.app = app
+        app.after_request(self.after_request)
+        app.extensions['compressor'] = self
+
+    def _encoder(self, coding):
+        config = self.app.config
+        if coding == 'zstd':
+            return _ZstdEncoder(config['COMPRESS_ZSTD_LEVEL'])
+        if coding == 'br':
+            return _BrotliEncoder(config['COMPRESS_BR_LEVEL'])
+        return _GzipEncoder(config['COMPRESS_LEVEL'])
+
+    def _record(self, endpoint, coding, bytes_in, bytes_out, cpu):
+        with self._lock:
+            entry = self._stats.get(endpoint)
+            if entry is None:
+                entry = self._stats[endpoint] = {
+                    'responses': 0, 'bytes_in': 0, 'bytes_out': 0, 'cpu_seconds': 0.0, 'encodings': {}
+                }
+            entry['responses'] += 1
+            entry['bytes_in'] += bytes_in
+            entry['bytes_out'] += bytes_out
+            entry['cpu_seconds'] += cpu
+            entry['encodings'][coding] = entry['encodings'].get(coding, 0) + 1
+
+    def stats(self):
+        """Snapshot of per-endpoint compression counters."""
+        with self._lock:
+            snapshot = {}
+            for endpoint, entry in self._stats.items():
+                entry = dict(entry, encodings=dict(entry['encodings']))
+                entry['bytes_saved'] = entry['bytes_in'] - entry['bytes_out']
+                entry['ratio'] = round(entry['bytes_out'] / entry['bytes_in'], 4) if entry['bytes_in'] else None
+                snapshot[endpoint] = entry
+            return snapshot
+
+    def after_request(self, response):
+        config = self.app.config
+        if not config['COMPRESS_ENABLED']:
+            return response
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in config['COMPRESS_MIMETYPES']):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        coding = negotiate(request.headers.get('Accept-Encoding'), config['COMPRESS_ENCODINGS'])
+        if coding is None:
+            return response
+
+        endpoint = request.endpoint or 'unknown'
+        if response.is_streamed:
+            response.response = self._stream(response.response, coding, endpoint)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < config['COMPRESS_MIN_SIZE']:
+                return response
+            started = time.thread_time()
+            encoder = self._encoder(coding)
+            compressed = encoder.compress(body) + encoder.finish()
+            cpu = time.thread_time() - started
+            if len(compressed) >= len(body):
+                self._record(endpoint, 'identity', len(body), len(body), cpu)
+                return response
+            self._record(endpoint, coding, len(body), len(compressed), cpu)
+            response.set_data(compressed)
+        response.headers['Content-Encoding'] = coding
+        return response
+
+    def _stream(self, chunks, coding, endpoint):
+        encoder = self._encoder(coding)
+        bytes_in = bytes_out = 0
+        cpu = 0.0
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                if not chunk:
+                    continue
+                started = time.thread_time()
+                data = encoder.compress(chunk) + encoder.flush()
+                cpu += time.thread_time() - started
+                bytes_in += len(chunk)
+                bytes_out += len(data)
+                yield data
+            started = time.thread_time()
+            data = encoder.finish()
+            cpu += time.thread_time() - started
+            bytes_out += len(data)
+            yield data
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
+            self._record(endpoint, coding, bytes_in, bytes_out, cpu)
@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+import weakref
+from collections import deque
+
+import pymysql
+
+# Every pool created in this process, so fork/exit hooks can reach them
+_pools = weakref.WeakSet()
+
+
+class ConnectionPool:
+    """Small thread-safe PyMySQL connection pool (one per worker process).
+
+    Idle connections are reused LIFO; when all are checked out a new one is
+    opened rather than blocking, and connections beyond ``size`` are closed
+    on release. Connections idle longer than ``ping_after`` seconds are
+    pinged before reuse, and those idle past ``max_idle`` are dropped.
+    """
+
+    def __init__(self, config, size=5, max_idle=300, ping_after=30, connect=pymysql.connect):
+        self.config = dict(config)
+        self.config.setdefault('autocommit', True)
+        self.size = size
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+        self._connect = connect
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+        _pools.add(self)
+
+    def acquire(self):
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection, last_used = self._idle.pop()
+            idle_for = now - last_used
+            if idle_for > self.max_idle:
+                self._close(connection)
+                continue
+            if idle_for > self.ping_after:
+                try:
+                    connection.ping(reconnect=False)
+                except Exception:
+                    self._close(connection)
+                    continue
+            with self._lock:
+                self.reused += 1
+                self.in_use += 1
+            return connection
+        connection = self._connect(**self.config)
+        with self._lock:
+            self.created += 1
+            self.in_use += 1
+        return connection
+
+    def release(self, connection):
+        with self._lock:
+            self.in_use -= 1
+            if len(self._idle) < self.size:
+                self._idle.append((connection, time.monotonic()))
+                return
+        self._close(connection)
+
+    def discard(self, connection):
+        """Drop a connection that may be in a bad state instead of reusing it."""
+        with self._lock:
+            self.in_use -= 1
+        self._close(connection)
+
+    def warm(self, count=None):
+        """Open up to ``count`` (default ``size``) idle connections ahead of traffic.
+
+        Connections already idle or checked out by request threads count
+        towards ``count``, so warming never takes the pool past ``size``.
+        """
+        count = self.size if count is None else min(count, self.size)
+        with self._lock:
+            deficit = count - len(self._idle) - self.in_use
+        opened = 0
+        for _ in range(max(0, deficit)):
+            try:
+                connection = self._connect(**self.config)
+            except Exception as e:
+                print(f"Connection pool warm-up failed: {e}")
+                break
+            with self._lock:
+                # Request threads may have opened connections meanwhile
+                if len(self._idle) + self.in_use < count:
+                    self.created += 1
+                    self._idle.append((connection, time.monotonic()))
+                    opened += 1
+                    continue
+            self._close(connection)
+            break
+        return opened
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for connection, _ in idle:
+            self._close(connection)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "in_use": self.in_use,
+                "created": self.created,
+                "reused": self.reused
+            }
+
+    def _after_fork(self):
+        # Sockets inherited from the parent belong to the parent's sessions:
+        # forget them without sending COM_QUIT on the shared file descriptors.
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self.in_use = 0
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+def after_fork():
+    for pool in list(_pools):
+        pool._after_fork()
+
+
+def warm_all(background=True):
+    """Pre-open connections in every pool, by default off the calling thread."""
+    def run():
+        for pool in list(_pools):
+            pool.warm()
+    if background:
+        threading.Thread(target=run, name='db-pool-warmup', daemon=True).start()
+    else:
+        run()
+
+
+def close_all():
+    for pool in list(_pools):
+        pool.close()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=after_fork)
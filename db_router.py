@@ -0,0 +1,212 @@
+"""Read-replica routing with replication-lag checks and read-your-writes pins.
+
+Read-only helpers ask :meth:`ReplicaRouter.choose` for a replica; writes,
+reads inside write requests and reads for a recently-writing session go
+to the primary. A background thread polls each replica's
+``SHOW REPLICA STATUS`` (``SHOW SLAVE STATUS`` before MySQL 8.0.22) and
+only replicas that are reachable and less than ``max_lag`` seconds behind
+receive traffic; the rest are skipped until a later check passes.
+
+Trying it locally with two MySQL 8 containers (primary + one replica)::
+
+    docker network create ostrich
+    docker run -d --name primary --network ostrich -p 3306:3306 -e MYSQL_ROOT_PASSWORD=pw \\
+        mysql:8 --server-id=1 --log-bin --gtid-mode=ON --enforce-gtid-consistency=ON
+    docker run -d --name replica --network ostrich -p 3307:3306 -e MYSQL_ROOT_PASSWORD=pw \\
+        mysql:8 --server-id=2 --gtid-mode=ON --enforce-gtid-consistency=ON --read-only=ON
+    # on the replica:
+    #   CHANGE REPLICATION SOURCE TO SOURCE_HOST='primary', SOURCE_USER='root',
+    #       SOURCE_PASSWORD='pw', SOURCE_AUTO_POSITION=1, GET_SOURCE_PUBLIC_KEY=1;
+    #   START REPLICA;
+    # CREATE DATABASE ostrich on the primary, then load schema and data (replicated to the replica):
+    python seed_data.py --host 127.0.0.1 --password pw --database ostrich --create-schema --tickets 100000
+    DB_HOST=127.0.0.1 DB_PORT=3306 DB_USER=root DB_PASSWORD=pw DB_NAME=ostrich \
+        DB_REPLICAS=127.0.0.1:3307 python main.py --dev
+
+``STOP REPLICA SQL_THREAD`` on the replica (or a long write on the
+primary) makes it fall behind and drop out of rotation.
+"""
+import hashlib
+import hmac
+import itertools
+import threading
+import time
+
+import pymysql
+import pymysql.cursors
+
+
+class Replica:
+    def __init__(self, name, pool):
+        self.name = name
+        self.pool = pool
+        self.healthy = False     # until the first check passes
+        self.lag = None
+        self.last_error = None
+        self.routed = 0
+
+
+class ReplicaRouter:
+    """Chooses a healthy replica (round robin) for read-only queries.
+
+    ``pin(session)`` sends that session's reads to the primary for
+    ``pin_seconds`` so a technician sees their own writes despite lag.
+    The pin is recorded in this process and also returned as a token
+    (wall-clock expiry signed with ``secret``) for the client to send
+    back, so whichever gunicorn worker serves the next request honours
+    it: pass it to :meth:`choose`.
+    """
+
+    def __init__(self, replicas=(), max_lag=5.0, check_interval=5.0, pin_seconds=5.0, secret='',
+                 clock=time.monotonic, wall_clock=time.time):
+        self.replicas = list(replicas)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.pin_seconds = pin_seconds
+        self._secret = secret.encode()
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._lock = threading.Lock()
+        self._pins = {}
+        self._counter = itertools.count()
+        self._thread = None
+        self._stop = threading.Event()
+        self.no_replica_reads = 0
+        self.pinned_reads = 0
+
+    # ----- routing -----
+    def choose(self, session=None, pin_token=None):
+        """A healthy replica for a read, or ``None`` to use the primary."""
+        if not self.replicas:
+            return None
+        self.start()
+        if session is not None and (self.is_pinned(session) or self.token_pins(session, pin_token)):
+            self.pinned_reads += 1
+            return None
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            self.no_replica_reads += 1
+            return None
+        replica = healthy[next(self._counter) % len(healthy)]
+        replica.routed += 1
+        return replica
+
+    def pin(self, session):
+        """Pin ``session``'s reads; returns the token that pins them in every worker, or ``None``."""
+        if not self.replicas or session is None:
+            return None
+        now = self._clock()
+        with self._lock:
+            self._pins[session] = now + self.pin_seconds
+            if len(self._pins) > 10000:
+                self._pins = {key: until for key, until in self._pins.items() if until > now}
+        until = int(self._wall_clock() + self.pin_seconds + 1)
+        return f"{until}.{self._sign(session, until)}"
+
+    def token_pins(self, session, token):
+        """Whether ``token`` (from :meth:`pin`) is ``session``'s and has not expired."""
+        try:
+            until, signature = token.split('.', 1)
+            until = int(until)
+        except (AttributeError, ValueError):
+            return False
+        return until > self._wall_clock() and hmac.compare_digest(signature, self._sign(session, until))
+
+    def _sign(self, session, until):
+        return hmac.new(self._secret, f"{session}:{until}".encode(), hashlib.sha256).hexdigest()
+
+    def is_pinned(self, session):
+        with self._lock:
+            until = self._pins.get(session)
+        return until is not None and until > self._clock()
+
+    def mark_down(self, replica, error):
+        """Take a replica out of rotation until its next successful check."""
+        if replica.healthy:
+            print(f"Replica {replica.name} marked unhealthy: {error}")
+        replica.healthy = False
+        replica.last_error = str(error)
+
+    # ----- health checks -----
+    def check(self, replica):
+        try:
+            connection = replica.pool.acquire()
+        except Exception as e:
+            self.mark_down(replica, e)
+            return False
+        try:
+            lag = self._replication_lag(connection)
+        except Exception as e:
+            replica.pool.discard(connection)
+            self.mark_down(replica, e)
+            return False
+        replica.pool.release(connection)
+        replica.lag = lag
+        if lag is None:
+            self.mark_down(replica, "replication is not running")
+            return False
+        if lag > self.max_lag:
+            self.mark_down(replica, f"{lag}s behind (limit {self.max_lag}s)")
+            return False
+        if not replica.healthy:
+            print(f"Replica {replica.name} healthy ({lag}s behind)")
+        replica.healthy = True
+        replica.last_error = None
+        return True
+
+    @staticmethod
+    def _replication_lag(connection):
+        """Seconds behind the source, or ``None`` if this server is not replicating."""
+        cursor = connection.cursor(pymysql.cursors.DictCursor)
+        try:
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except pymysql.err.ProgrammingError:
+                cursor.execute("SHOW SLAVE STATUS")  # MySQL < 8.0.22
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        if not row:
+            return None
+        lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+        return None if lag is None else float(lag)
+
+    def check_all(self):
+        return sum(self.check(replica) for replica in self.replicas)
+
+    def start(self):
+        """Start the health-check thread (once per process; safe after fork)."""
+        if not self.replicas or (self._thread is not None and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='replica-health', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.check_all()
+            except Exception as e:
+                print(f"Replica health check failed: {e}")
+            if self._stop.wait(self.check_interval):
+                return
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag,
+                    "routed_reads": replica.routed,
+                    "last_error": replica.last_error
+                } for replica in self.replicas
+            ],
+            "no_replica_reads": self.no_replica_reads,
+            "pinned_reads": self.pinned_reads
+        }
@@ -0,0 +1,309 @@
+"""Embedded MySQL stand-in for benchmarks and local runs.
+
+A thin PyMySQL-compatible wrapper around sqlite3: ``%s`` placeholders,
+buffered cursors with a ``description`` carrying MySQL FIELD_TYPE codes
+(so serializers.RowSerializer sees DATETIME/DECIMAL columns as it would
+against MySQL), DictCursor support, and the schema that
+setup_aiven_db.py produces after its migrations.
+
+    conn = fakedb.connect('/tmp/ostrich.db')      # or ':memory:'
+    fakedb.create_schema(conn)
+
+It is not a SQL translator: only the MySQL spellings used in this repo
+(INSERT IGNORE, NOW(), %s params) are rewritten.
+"""
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+
+import pymysql.cursors
+from pymysql.constants import FIELD_TYPE
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS technicians (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        employee_id VARCHAR(50) UNIQUE,
+        full_name VARCHAR(100),
+        email VARCHAR(100),
+        phone VARCHAR(20),
+        role VARCHAR(50) DEFAULT 'technician',
+        specializations JSON,
+        experience_years INT DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS customers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name VARCHAR(100),
+        phone VARCHAR(20),
+        address TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS service_tickets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ticket_number VARCHAR(50) UNIQUE,
+        customer_id INT,
+        customer_name VARCHAR(100),
+        customer_phone VARCHAR(20),
+        customer_address TEXT,
+        product_name VARCHAR(100),
+        product_model VARCHAR(50),
+        issue_description TEXT,
+        status VARCHAR(20) DEFAULT 'SCHEDULED',
+        priority VARCHAR(20) DEFAULT 'MEDIUM',
+        assigned_staff_id INT,
+        scheduled_date DATETIME,
+        completed_at DATETIME NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS notifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INT,
+        title VARCHAR(200),
+        message TEXT,
+        type VARCHAR(50),
+        is_read BOOLEAN DEFAULT 0,
+        ticket_id INT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS inventory (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        part_number VARCHAR(50) UNIQUE,
+        name VARCHAR(100),
+        category VARCHAR(50),
+        quantity_available INT DEFAULT 0,
+        unit_cost DECIMAL(10,2),
+        location VARCHAR(100),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS ticket_parts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ticket_id INT NOT NULL,
+        part_id INT NULL,
+        name VARCHAR(100),
+        quantity INT DEFAULT 1,
+        cost DECIMAL(10,2),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS ticket_photos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ticket_id INT NOT NULL,
+        url VARCHAR(500),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS idempotency_keys (
+        scope VARCHAR(64) NOT NULL,
+        idempotency_key VARCHAR(255) NOT NULL,
+        fingerprint CHAR(64) NOT NULL,
+        status_code SMALLINT NULL,
+        content_type VARCHAR(100) NULL,
+        body BLOB NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        expires_at DATETIME NOT NULL,
+        PRIMARY KEY (scope, idempotency_key)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_assignee_status_date ON service_tickets (assigned_staff_id, status, scheduled_date)",
+    "CREATE INDEX IF NOT EXISTS idx_tickets_customer ON service_tickets (customer_id)",
+    "CREATE INDEX IF NOT EXISTS idx_notifications_user_read_created ON notifications (user_id, is_read, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_ticket_parts_ticket ON ticket_parts (ticket_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ticket_photos_ticket ON ticket_photos (ticket_id)",
+    "CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys (expires_at)",
+]
+
+TABLES = ('technicians', 'customers', 'service_tickets', 'notifications', 'inventory', 'ticket_parts', 'ticket_photos')
+
+
+def _parse_datetime(value):
+    text = value.decode()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter('DATETIME', _parse_datetime)
+sqlite3.register_converter('TIMESTAMP', _parse_datetime)
+sqlite3.register_converter('DECIMAL', lambda value: Decimal(value.decode()))
+
+_TYPE_CODES = (
+    (bool, FIELD_TYPE.TINY),
+    (int, FIELD_TYPE.LONGLONG),
+    (float, FIELD_TYPE.DOUBLE),
+    (Decimal, FIELD_TYPE.NEWDECIMAL),
+    (datetime, FIELD_TYPE.DATETIME),
+    (date, FIELD_TYPE.DATE),
+    (bytes, FIELD_TYPE.BLOB),
+)
+
+_PLACEHOLDER = re.compile(r"%\((\w+)\)s|%s")
+_REWRITES = (
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+)
+
+
+def _translate(query):
+    if isinstance(query, bytes):
+        query = query.decode('utf-8')
+    query = _PLACEHOLDER.sub(lambda m: f":{m.group(1)}" if m.group(1) else "?", query)
+    for pattern, replacement in _REWRITES:
+        query = pattern.sub(replacement, query)
+    return query
+
+
+def _type_code(values):
+    for value in values:
+        if value is None:
+            continue
+        for python_type, code in _TYPE_CODES:
+            if isinstance(value, python_type):
+                return code
+        return FIELD_TYPE.VAR_STRING
+    return FIELD_TYPE.NULL
+
+
+class Cursor:
+    """Buffered cursor mimicking pymysql.cursors.Cursor."""
+
+    def __init__(self, connection, as_dict=False):
+        self.connection = connection
+        self._as_dict = as_dict
+        self.description = None
+        self.rowcount = -1
+        self.lastrowid = None
+        self._rows = []
+        self._index = 0
+
+    def execute(self, query, args=None):
+        sql = _translate(query)
+        if args is None:
+            args = ()
+        elif not isinstance(args, dict):
+            args = tuple(args)
+        with self.connection._lock:
+            cursor = self.connection._db.execute(sql, args)
+            rows = cursor.fetchall() if cursor.description else []
+            self.lastrowid = cursor.lastrowid
+            self.rowcount = len(rows) if cursor.description else cursor.rowcount
+            if cursor.description:
+                names = [column[0] for column in cursor.description]
+                self.description = tuple(
+                    (name, _type_code(row[i] for row in rows), None, None, None, None, True)
+                    for i, name in enumerate(names)
+                )
+            else:
+                self.description = None
+            if self.connection._autocommit:
+                self.connection._db.commit()
+        if self._as_dict and self.description:
+            names = [column[0] for column in self.description]
+            rows = [dict(zip(names, row)) for row in rows]
+        self._rows = rows
+        self._index = 0
+        return self.rowcount
+
+    def executemany(self, query, args):
+        sql = _translate(query)
+        with self.connection._lock:
+            cursor = self.connection._db.executemany(sql, [tuple(a) if not isinstance(a, dict) else a for a in args])
+            self.rowcount = cursor.rowcount
+            self.description = None
+            if self.connection._autocommit:
+                self.connection._db.commit()
+        self._rows = []
+        return self.rowcount
+
+    def fetchone(self):
+        if self._index >= len(self._rows):
+            return None
+        row = self._rows[self._index]
+        self._index += 1
+        return row
+
+    def fetchmany(self, size=1):
+        rows = self._rows[self._index:self._index + size]
+        self._index += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._rows[self._index:]
+        self._index = len(self._rows)
+        return rows
+
+    def close(self):
+        self._rows = []
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Connection:
+    """PyMySQL-like connection over a (possibly shared) sqlite3 database."""
+
+    def __init__(self, path=':memory:', autocommit=True):
+        uri = path.startswith('file:')
+        self._db = sqlite3.connect(
+            path, uri=uri, timeout=30, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level=None if autocommit else ''
+        )
+        self._lock = threading.RLock()
+        self._autocommit = autocommit
+        self.open = True
+
+    def cursor(self, cursorclass=None):
+        as_dict = cursorclass is not None and issubclass(cursorclass, pymysql.cursors.DictCursorMixin)
+        return Cursor(self, as_dict)
+
+    def commit(self):
+        with self._lock:
+            self._db.commit()
+
+    def rollback(self):
+        with self._lock:
+            self._db.rollback()
+
+    def begin(self):
+        with self._lock:
+            if not self._db.in_transaction:
+                self._db.execute("BEGIN")
+
+    def autocommit(self, value):
+        self._autocommit = bool(value)
+
+    def ping(self, reconnect=False):
+        if not self.open:
+            raise pymysql.err.InterfaceError(0, '')
+
+    def close(self):
+        if self.open:
+            self._db.close()
+            self.open = False
+
+
+def connect(path=':memory:', autocommit=True, **_mysql_kwargs):
+    """Drop-in for ``pymysql.connect``; MySQL connection kwargs are ignored."""
+    return Connection(path, autocommit=autocommit)
+
+
+def create_schema(connection):
+    cursor = connection.cursor()
+    for statement in SCHEMA:
+        cursor.execute(statement)
+    cursor.close()
+
+
+def truncate(connection, tables=TABLES):
+    cursor = connection.cursor()
+    for table in tables:
+        cursor.execute(f"DELETE FROM {table}")
+    cursor.close()
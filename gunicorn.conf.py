@@ -0,0 +1,76 @@
+# Gunicorn settings for the Ostrich Service Technician API.
+#
+#   gunicorn --config gunicorn.conf.py main:app     (or: python main.py)
+#
+# Worker model
+# ------------
+# Every request does blocking PyMySQL I/O against Aiven, so a request spends
+# most of its time waiting on the network, not on the CPU. We therefore run a
+# few pre-forked processes (WEB_CONCURRENCY) each with a pool of threads
+# (GUNICORN_THREADS, "gthread" worker). While one thread waits on MySQL the
+# GIL is released and the other threads of the same worker keep serving;
+# processes give CPU parallelism for JSON encoding/compression. Concurrency
+# per instance is workers x threads, and each worker keeps its own DB
+# connection pool (DB_POOL_SIZE, default 5), which should be >= threads so
+# threads do not open overflow connections.
+#
+# The app is imported once in the master (preload_app) so workers share its
+# memory copy-on-write. No DB connections are opened at import time; each
+# worker warms its own pool in the background once it is ready to accept
+# (post_worker_init), and sockets that would have been inherited are
+# dropped by db_pool's at-fork handler.
+#
+# Reload and drain
+# ----------------
+#   kill -HUP <master>    start new workers with the current config, then
+#                         gracefully stop the old ones (with preload_app the
+#                         application code is NOT re-imported)
+#   kill -USR2 <master>   re-exec the master with new code, then
+#   kill -WINCH <old>     drain the old workers and kill -TERM the old master
+#   kill -TERM <master>   graceful shutdown: stop accepting, finish in-flight
+#                         requests for up to graceful_timeout seconds
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8002')}"
+
+worker_class = 'gthread'
+workers = int(os.getenv('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 4)))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+preload_app = True
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+
+# Recycle workers periodically to bound memory growth; jitter avoids
+# restarting every worker at once.
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    import db_pool
+    db_pool.after_fork()
+
+
+def post_worker_init(worker):
+    # The listening socket is already bound by the master; build the URL
+    # matcher and warm the DB pool without delaying the worker's first
+    # accept(). The Swagger spec stays deferred to the first /docs/ hit.
+    start_warm_up = worker.wsgi.extensions.get('warm_up')
+    if start_warm_up is not None:
+        start_warm_up()
+
+
+def worker_exit(server, worker):
+    # Write coalesced notification read marks before the pool goes away
+    read_state = getattr(getattr(worker, 'wsgi', None), 'extensions', {}).get('read_state')
+    if read_state is not None:
+        read_state.close()
+    import db_pool
+    db_pool.close_all()
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+COMPONENTS = ('technician', 'tickets', 'notifications')
+
+
+class HomeSnapshot:
+    """One technician's rendered home views and the components they are rendered from."""
+    __slots__ = ('technician', 'tickets', 'notifications', 'views', 'valid_until', 'expires', 'dirty', 'version')
+
+    def __init__(self, expires):
+        self.technician = None
+        self.tickets = None
+        self.notifications = None
+        self.views = {}            # view name -> rendered body
+        self.valid_until = None    # wall-clock ISO timestamp after which dated components are wrong
+        self.expires = expires
+        self.dirty = set(COMPONENTS)   # not loaded yet, or invalidated by a write
+        self.version = 0
+
+
+class SnapshotStore:
+    """Per-technician home views rendered once and refreshed on write.
+
+    ``loaders`` maps each component (technician row, ticket summary,
+    notification state) to ``fn(technician_id)`` returning its value, or
+    ``None`` when the DB is unavailable; nothing is cached then. ``views``
+    maps each view name to the components it is rendered from, and
+    ``render(view, snapshot)`` renders one view (usually JSON bytes).
+
+    :meth:`get` loads only the components the requested view needs that
+    are missing or dirty, and re-renders only that view. ``dated`` maps a
+    component to ``fn(value)`` giving the wall-clock ISO time its value
+    goes out of date (day rollover, a scheduled ticket falling overdue);
+    it is reloaded after that. :meth:`invalidate` marks components dirty
+    after a write. Invalidation is per process, so whole snapshots are
+    rebuilt after ``ttl`` seconds to pick up writes made through other
+    workers or other systems.
+    """
+
+    def __init__(self, loaders, views, render, dated=None, ttl=30.0, max_entries=5000, clock=time.monotonic,
+                 now=lambda: datetime.now().isoformat()):
+        self._loaders = loaders
+        self._views = {view: frozenset(components) for view, components in views.items()}
+        self._render = render
+        self._dated = dated or {}
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._now = now
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.builds = 0
+        self.loads = 0
+        self.unavailable = 0
+        self.invalidations = 0
+
+    def get(self, technician_id, view):
+        """The rendered ``view``, or ``None`` if it cannot be built from live data."""
+        needed = self._views[view]
+        now = self._clock()
+        with self._lock:
+            snapshot = self._entries.get(technician_id)
+            if snapshot is None or snapshot.expires <= now:
+                snapshot = self._entries[technician_id] = HomeSnapshot(now + self.ttl)
+                self._evict()
+            self._entries.move_to_end(technician_id)
+            stale = needed & snapshot.dirty
+            if snapshot.valid_until is not None and self._now() > snapshot.valid_until:
+                stale |= needed & self._dated.keys()
+            body = snapshot.views.get(view)
+            if body is not None and not stale:
+                self.hits += 1
+                return body
+            version = snapshot.version
+
+        values = {}
+        for component in stale:
+            value = self._loaders[component](technician_id)
+            self.loads += 1
+            if value is None:
+                self.unavailable += 1
+                return None
+            values[component] = value
+
+        rebuilt = HomeSnapshot(snapshot.expires)
+        for component in COMPONENTS:
+            setattr(rebuilt, component, values[component] if component in values else getattr(snapshot, component))
+        until = [until_fn(getattr(rebuilt, component)) for component, until_fn in self._dated.items()
+                 if getattr(rebuilt, component) is not None]
+        rebuilt.valid_until = min(until) if until else None
+        # Views rendered from components that were just reloaded are re-rendered when next asked for
+        rebuilt.views = {name: rendered for name, rendered in snapshot.views.items() if not self._views[name] & stale}
+        body = rebuilt.views[view] = self._render(view, rebuilt)
+        self.builds += 1
+
+        with self._lock:
+            if self._entries.get(technician_id) is snapshot:
+                # Components invalidated while loading stay dirty for the next reader
+                rebuilt.dirty = snapshot.dirty - stale if snapshot.version == version else set(snapshot.dirty)
+                rebuilt.version = snapshot.version
+                self._entries[technician_id] = rebuilt
+        return body
+
+    def invalidate(self, technician_id, *components):
+        """Mark ``components`` (default: all) of this technician's snapshot for reloading."""
+        with self._lock:
+            snapshot = self._entries.get(technician_id)
+            if snapshot is None:
+                return
+            snapshot.dirty.update(components or COMPONENTS)
+            snapshot.version += 1
+            self.invalidations += 1
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "builds": self.builds,
+                "loads": self.loads,
+                "unavailable": self.unavailable,
+                "invalidations": self.invalidations
+            }
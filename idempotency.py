@@ -0,0 +1,226 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+# begin() outcomes
+EXECUTE = 'execute'          # caller owns the key: run the request, then complete() or abandon()
+REPLAY = 'replay'            # value is the stored (status_code, content_type, body)
+MISMATCH = 'mismatch'        # key already used for a different request
+IN_PROGRESS = 'in_progress'  # another execution did not finish within wait_timeout
+
+
+class _Entry:
+    __slots__ = ('fingerprint', 'response', 'expires', 'done')
+
+    def __init__(self, fingerprint, expires):
+        self.fingerprint = fingerprint
+        self.response = None
+        self.expires = expires
+        self.done = threading.Event()
+
+
+class IdempotencyStore:
+    """Remembers responses of write requests by ``(scope, Idempotency-Key)``.
+
+    The first request for a key executes; retries with the same key and
+    request fingerprint get the stored response back, and concurrent
+    duplicates wait for the in-flight execution instead of running it
+    again. Entries live for ``ttl`` seconds in a bounded in-process LRU.
+
+    With ``connect`` (a context manager yielding a DB connection or
+    ``None``, i.e. ``main.get_db_connection``) keys are also claimed in the
+    ``idempotency_keys`` table, so duplicates landing on other worker
+    processes or instances are caught too. A claim that is not completed
+    within ``lease`` seconds (its process died) can be taken over. When the
+    DB is unavailable the store degrades to in-process only.
+    """
+
+    def __init__(self, ttl=86400, max_entries=10000, wait_timeout=10.0, connect=None, lease=60.0,
+                 poll_interval=0.1, clock=time.monotonic):
+        self.ttl = ttl
+        self.lease = lease
+        self.max_entries = max_entries
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._connect = connect
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.replays = 0
+        self.waits = 0
+        self.executions = 0
+        self._completed = 0
+
+    def begin(self, scope, key, fingerprint):
+        """Returns ``(outcome, value)``; see the module-level outcome constants."""
+        deadline = self._clock() + self.wait_timeout
+        entry_key = (scope, key)
+        while True:
+            now = self._clock()
+            with self._lock:
+                entry = self._entries.get(entry_key)
+                if entry is not None and entry.expires <= now and entry.response is not None:
+                    del self._entries[entry_key]
+                    entry = None
+                if entry is None:
+                    entry = self._entries[entry_key] = _Entry(fingerprint, now + self.ttl)
+                    self._evict(now)
+                    owner = True
+                else:
+                    owner = False
+                    if entry.fingerprint != fingerprint:
+                        return MISMATCH, None
+                    if entry.response is not None:
+                        self._entries.move_to_end(entry_key)
+                        self.replays += 1
+                        return REPLAY, entry.response
+            if owner:
+                return self._claim_shared(entry_key, entry, fingerprint, deadline)
+            self.waits += 1
+            if not entry.done.wait(max(0.0, deadline - self._clock())):
+                return IN_PROGRESS, None
+            # Completed (loop replays it) or abandoned (loop claims it)
+
+    def complete(self, scope, key, status_code, content_type, body):
+        response = (status_code, content_type, body)
+        with self._lock:
+            entry = self._entries.get((scope, key))
+        if entry is None:
+            return
+        entry.response = response
+        entry.done.set()
+        if self._connect is not None:
+            self._db_complete(scope, key, response)
+
+    def abandon(self, scope, key):
+        """Forget an execution that failed so a retry can run it again."""
+        with self._lock:
+            entry = self._entries.get((scope, key))
+            if entry is not None and entry.response is None:
+                del self._entries[(scope, key)]
+            else:
+                entry = None
+        if entry is not None:
+            entry.done.set()
+            if self._connect is not None:
+                self._db_abandon(scope, key)
+
+    def _evict(self, now):
+        # Expired entries first, then oldest; never an in-flight one (its waiters hold it)
+        for entry_key, entry in list(itertools.islice(self._entries.items(), 16)):
+            if entry.response is not None and entry.expires <= now:
+                del self._entries[entry_key]
+        while len(self._entries) > self.max_entries:
+            for entry_key, entry in self._entries.items():
+                if entry.response is not None:
+                    del self._entries[entry_key]
+                    break
+            else:
+                return
+
+    def _claim_shared(self, entry_key, entry, fingerprint, deadline):
+        """Claim the key in the DB too; wait there if another process holds it."""
+        outcome, value = EXECUTE, None
+        if self._connect is not None:
+            outcome, value = self._db_claim(*entry_key, fingerprint)
+            while outcome == 'wait' and self._clock() < deadline:
+                time.sleep(self.poll_interval)
+                outcome, value = self._db_claim(*entry_key, fingerprint)
+        if outcome == EXECUTE:
+            self.executions += 1
+            return EXECUTE, None
+        with self._lock:
+            if outcome == REPLAY:
+                entry.response = value
+                self.replays += 1
+            elif self._entries.get(entry_key) is entry:
+                del self._entries[entry_key]
+        entry.done.set()
+        return (IN_PROGRESS, None) if outcome == 'wait' else (outcome, value)
+
+    # ----- optional DB table (see setup_aiven_db migration 6) -----
+    def _db_claim(self, scope, key, fingerprint):
+        try:
+            with self._connect() as conn:
+                if not conn:
+                    return EXECUTE, None
+                cursor = conn.cursor()
+                try:
+                    for _ in range(2):
+                        cursor.execute(
+                            "INSERT IGNORE INTO idempotency_keys (scope, idempotency_key, fingerprint, expires_at) "
+                            "VALUES (%s, %s, %s, %s)",
+                            (scope, key, fingerprint, datetime.now() + timedelta(seconds=self.lease))
+                        )
+                        if cursor.rowcount == 1:
+                            return EXECUTE, None
+                        cursor.execute(
+                            "SELECT fingerprint, status_code, content_type, body, expires_at FROM idempotency_keys "
+                            "WHERE scope = %s AND idempotency_key = %s",
+                            (scope, key)
+                        )
+                        row = cursor.fetchone()
+                        if row is None:
+                            continue
+                        stored_fingerprint, status_code, content_type, body, expires_at = row
+                        if expires_at <= datetime.now():
+                            cursor.execute(
+                                "DELETE FROM idempotency_keys WHERE scope = %s AND idempotency_key = %s", (scope, key))
+                            continue
+                        if stored_fingerprint != fingerprint:
+                            return MISMATCH, None
+                        if status_code is None:
+                            return 'wait', None
+                        return REPLAY, (status_code, content_type, bytes(body or b''))
+                    return EXECUTE, None
+                finally:
+                    cursor.close()
+        except Exception as e:
+            print(f"Idempotency key lookup failed, using in-process store only: {e}")
+            return EXECUTE, None
+
+    def _db_complete(self, scope, key, response):
+        status_code, content_type, body = response
+        try:
+            with self._connect() as conn:
+                if not conn:
+                    return
+                cursor = conn.cursor()
+                cursor.execute(
+                    "UPDATE idempotency_keys SET status_code = %s, content_type = %s, body = %s, expires_at = %s "
+                    "WHERE scope = %s AND idempotency_key = %s",
+                    (status_code, content_type, body, datetime.now() + timedelta(seconds=self.ttl), scope, key)
+                )
+                self._completed += 1
+                if self._completed % 100 == 0:
+                    cursor.execute("DELETE FROM idempotency_keys WHERE expires_at < %s", (datetime.now(),))
+                cursor.close()
+        except Exception as e:
+            print(f"Storing idempotent response failed: {e}")
+
+    def _db_abandon(self, scope, key):
+        try:
+            with self._connect() as conn:
+                if not conn:
+                    return
+                cursor = conn.cursor()
+                cursor.execute(
+                    "DELETE FROM idempotency_keys WHERE scope = %s AND idempotency_key = %s AND status_code IS NULL",
+                    (scope, key)
+                )
+                cursor.close()
+        except Exception as e:
+            print(f"Releasing idempotency key failed: {e}")
+
+    def stats(self):
+        with self._lock:
+            in_flight = sum(1 for entry in self._entries.values() if entry.response is None)
+            return {
+                "entries": len(self._entries),
+                "in_flight": in_flight,
+                "executions": self.executions,
+                "replays": self.replays,
+                "waits": self.waits
+            }
@@ -0,0 +1,52 @@
+class BatchLoader:
+    """DataLoader-style batching and caching for one kind of related entity.
+
+    ``batch_fn(keys)`` resolves many keys with a single query and returns
+    ``{key: value}`` for the keys it found, or ``None`` when the source is
+    unavailable. Keys it did not return get ``default_factory()`` (``None``
+    if not given) and are cached too, so a missing entity is not queried
+    again. Nothing is cached for a failed batch.
+
+    Keep one loader per request: callers first collect every key they will
+    need, then call :meth:`load_many` once per entity type.
+    """
+
+    def __init__(self, batch_fn, default_factory=None, max_batch_size=500):
+        self._batch_fn = batch_fn
+        self._default_factory = default_factory
+        self.max_batch_size = max_batch_size
+        self._cache = {}
+        self.batches = 0
+        self.keys_loaded = 0
+
+    def prime(self, key, value):
+        self._cache.setdefault(key, value)
+
+    def load_many(self, keys):
+        """Return ``{key: value}``; keys that could not be loaded (source down) are left out."""
+        wanted = list(dict.fromkeys(key for key in keys if key is not None))
+        missing = [key for key in wanted if key not in self._cache]
+        for start in range(0, len(missing), self.max_batch_size):
+            chunk = missing[start:start + self.max_batch_size]
+            found = self._batch_fn(chunk)
+            self.batches += 1
+            if found is None:
+                continue
+            self.keys_loaded += len(chunk)
+            for key in chunk:
+                self._cache[key] = found[key] if key in found else self._default()
+        return {key: self._cache[key] for key in wanted if key in self._cache}
+
+    def load(self, key):
+        return self.load_many([key]).get(key)
+
+    def _default(self):
+        return self._default_factory() if self._default_factory is not None else None
+
+
+def group_by(rows, key):
+    """``{row[key]: [rows...]}`` preserving row order within each group."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[key], []).append(row)
+    return groups
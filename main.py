@@ -1,17 +1,44 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, has_request_context, make_response
 from flask_cors import CORS
 from flask_restx import Api, Resource, fields, Namespace
+import hashlib
+import inspect
 import os
+import sys
 import jwt
+import threading
+import time
+import uuid
 from datetime import datetime, timedelta
-from functools import wraps
+from functools import partial, wraps
+from werkzeug.exceptions import HTTPException
 import pymysql
 from contextlib import contextmanager
+from serializers import dumps, fetch_dict, fetch_dicts, output_json, project_rows, to_compact
+from compression import Compressor
+from db_pool import ConnectionPool
+from db_router import Replica, ReplicaRouter
+from home_snapshot import SnapshotStore
+from loaders import BatchLoader, group_by
+from circuit_breaker import CircuitBreaker, StaleCache
+import idempotency
+import metrics
+from notification_state import ReadStateWriter
+from query_profiler import ProfiledCursor, profiler as query_profiler
 
 # Create Flask app first
 app = Flask(__name__)
 CORS(app)
 
+# Response compression (gzip, plus br/zstd when installed) for mobile links
+app.config['COMPRESS_ENABLED'] = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+app.config['COMPRESS_LEVEL'] = int(os.getenv('COMPRESS_LEVEL', 6))
+app.config['COMPRESS_BR_LEVEL'] = int(os.getenv('COMPRESS_BR_LEVEL', 4))
+app.config['COMPRESS_ZSTD_LEVEL'] = int(os.getenv('COMPRESS_ZSTD_LEVEL', 3))
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 500))
+compressor = Compressor(app)
+metrics.init_app(app)
+
 # Add root route before API setup
 @app.route('/')
 def api_root():
@@ -31,7 +58,9 @@ def api_root():
             "schedule": "/schedule/",
             "profile": "/profile/",
             "reports": "/reports/",
-            "inventory": "/inventory/"
+            "inventory": "/inventory/",
+            "batch": "/batch",
+            "metrics": "/metrics"
         }
     })
 
@@ -56,6 +85,10 @@ api = Api(app,
     security='Bearer'
 )
 
+# Compact JSON encoding for RESTX responses (orjson when installed)
+if os.getenv('FAST_JSON', 'true').lower() == 'true':
+    api.representations['application/json'] = output_json
+
 # Namespaces
 auth_ns = api.namespace('auth', description='Authentication Operations')
 dashboard_ns = api.namespace('dashboard', description='Dashboard & Overview')
@@ -72,27 +105,237 @@ app.config['SECRET_KEY'] = SECRET_KEY
 
 # Database configuration - Aiven MySQL
 DB_CONFIG = {
-    'host': 'mysql-ostrich-tviazone-5922.i.aivencloud.com',
-    'user': 'avnadmin',
+    'host': os.getenv('DB_HOST', 'mysql-ostrich-tviazone-5922.i.aivencloud.com'),
+    'user': os.getenv('DB_USER', 'avnadmin'),
     'password': os.getenv('DB_PASSWORD'),
-    'database': 'defaultdb',
-    'port': 16599,
+    'database': os.getenv('DB_NAME', 'defaultdb'),
+    'port': int(os.getenv('DB_PORT', 16599)),
     'charset': 'utf8mb4',
-    'ssl': {'ssl_mode': 'REQUIRED'}
+    'ssl': {'ssl_mode': 'REQUIRED'},
+    # Fail fast when Aiven is slow or unreachable; the circuit breaker does the rest
+    'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 3)),
+    'read_timeout': int(os.getenv('DB_READ_TIMEOUT', 10)),
+    'write_timeout': int(os.getenv('DB_WRITE_TIMEOUT', 10))
 }
 
+# One pool per worker process; size it to the worker's thread count.
+# Nothing connects at import time - see warm_up().
+# Pooled connections use ProfiledCursor so every statement is timed (see /debug/queries).
+connection_pool = ConnectionPool(dict(DB_CONFIG, cursorclass=ProfiledCursor), size=int(os.getenv('DB_POOL_SIZE', 5)))
+# Optional read replicas (DB_REPLICAS=host:port,host:port) share the primary's
+# credentials; read-only helpers are routed to them by db_router (see db_router.py)
+def replica_config(address):
+    host, _, port = address.strip().partition(':')
+    return dict(DB_CONFIG, host=host, port=int(port) if port else DB_CONFIG['port'], cursorclass=ProfiledCursor)
+
+db_router = ReplicaRouter(
+    [
+        Replica(address.strip(), ConnectionPool(replica_config(address), size=int(os.getenv('DB_POOL_SIZE', 5))))
+        for address in os.getenv('DB_REPLICAS', '').split(',') if address.strip()
+    ],
+    max_lag=float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', 5)),
+    check_interval=float(os.getenv('DB_REPLICA_CHECK_SECONDS', 5)),
+    pin_seconds=float(os.getenv('DB_PIN_AFTER_WRITE_SECONDS', 5)),
+    secret=SECRET_KEY
+)
+WRITE_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+# Read-your-writes pins travel with the client (cookie, or the header for
+# clients without a cookie jar) so every worker process sees them
+DB_PIN_COOKIE = 'db_pin_until'
+DB_PIN_HEADER = 'X-DB-Pin'
+query_profiler.threshold_ms = float(os.getenv('SLOW_QUERY_MS', 200))
+query_profiler.explain = os.getenv('SLOW_QUERY_EXPLAIN', 'true').lower() == 'true'
+
+# While the circuit is open get_db_connection() yields None immediately and
+# read helpers serve the last good result from stale_cache (see stale_or_fallback)
+db_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv('DB_BREAKER_FAILURES', 3)),
+    reset_timeout=float(os.getenv('DB_BREAKER_RESET_SECONDS', 30))
+)
+stale_cache = StaleCache(
+    max_entries=int(os.getenv('STALE_CACHE_ENTRIES', 10000)),
+    # Total row fields kept per worker (roughly 100 bytes each)
+    max_cells=int(os.getenv('STALE_CACHE_MAX_CELLS', 500000))
+)
+_db_status = threading.local()
+
+# MySQL client errors meaning the server is unreachable or the link dropped
+DB_UNAVAILABLE_ERRORS = (2003, 2006, 2013, 2055)
+
+def is_db_unavailable_error(e):
+    if isinstance(e, pymysql.err.InterfaceError):
+        return True
+    return isinstance(e, pymysql.err.OperationalError) and bool(e.args) and e.args[0] in DB_UNAVAILABLE_ERRORS
+
+def current_session():
+    """Technician id of the authenticated request (read pins, ticket ownership)."""
+    if has_request_context() and 'current_user' in g:
+        return g.current_user.get('sub')
+    return None
+
+def read_replica():
+    """Replica for a read-only query, or None when it must go to the primary."""
+    if getattr(_db_status, 'primary_only', False):
+        return None
+    if has_request_context() and request.method in WRITE_METHODS:
+        return None
+    return db_router.choose(current_session(), request_pin_token())
+
+def request_pin_token():
+    """The read-your-writes pin the client sent back (see pin_reads_after_write)."""
+    if not has_request_context():
+        return None
+    return request.cookies.get(DB_PIN_COOKIE) or request.headers.get(DB_PIN_HEADER)
+
 @contextmanager
-def get_db_connection():
-    connection = None
+def get_db_connection(read_only=False, pin_reads=True):
+    """Pooled connection, or None while the DB is unavailable.
+
+    ``read_only=True`` may be served by a healthy replica (see db_router);
+    a replica that cannot be reached is taken out of rotation and the
+    primary is used. One that fails mid-query is taken out of rotation too,
+    and helpers wrapped in retry_on_primary re-run once on the primary.
+    A write connection pins the technician's later reads to the primary
+    (see pin_reads_after_write) unless ``pin_reads=False``.
+    """
+    _db_status.unavailable = False
+    _db_status.replica = None
+    replica = read_replica() if read_only else None
+    if replica is not None:
+        try:
+            connection = replica.pool.acquire()
+        except Exception as e:
+            db_router.mark_down(replica, e)
+        else:
+            _db_status.replica = replica
+            try:
+                yield connection
+            except Exception as e:
+                replica.pool.discard(connection)
+                if is_db_unavailable_error(e):
+                    db_router.mark_down(replica, e)
+                    _db_status.replica_lost = True
+                raise
+            finally:
+                _db_status.replica = None
+            if _db_status.unavailable:
+                replica.pool.discard(connection)
+            else:
+                replica.pool.release(connection)
+            return
+    if not db_breaker.allow():
+        _db_status.unavailable = True
+        yield None
+        return
     try:
-        connection = pymysql.connect(**DB_CONFIG)
-        yield connection
+        connection = connection_pool.acquire()
     except Exception as e:
         print(f"Database connection failed: {e}")
+        db_breaker.record_failure()
+        _db_status.unavailable = True
         yield None
-    finally:
-        if connection:
-            connection.close()
+        return
+    if not read_only and pin_reads and has_request_context():
+        g.wrote_primary = True
+    # Every exit records an outcome, or a half-open breaker would keep its
+    # only trial slot and reject all later calls
+    try:
+        yield connection
+    except Exception as e:
+        connection_pool.discard(connection)
+        if is_db_unavailable_error(e):
+            db_breaker.record_failure()
+        else:
+            # The server answered (deadlock, lock wait timeout, missing table): it is reachable
+            db_breaker.record_success()
+        raise
+    except BaseException:
+        connection_pool.discard(connection)
+        db_breaker.release()
+        raise
+    if _db_status.unavailable:
+        connection_pool.discard(connection)
+        return
+    connection_pool.release(connection)
+    db_breaker.record_success()
+
+def mark_db_unavailable():
+    """For helpers that catch a connection-loss error mid-query themselves."""
+    _db_status.unavailable = True
+    replica = getattr(_db_status, 'replica', None)
+    if replica is not None:
+        db_router.mark_down(replica, "connection lost mid-query")
+        _db_status.replica_lost = True
+    else:
+        db_breaker.record_failure()
+
+def retry_on_primary(f):
+    """Re-run a read-only helper once on the primary if its replica dropped mid-query."""
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        _db_status.replica_lost = False
+        try:
+            result = f(*args, **kwargs)
+        except Exception:
+            if not _db_status.replica_lost:
+                raise
+        else:
+            if not _db_status.replica_lost:
+                return result
+        _db_status.primary_only = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            _db_status.primary_only = False
+            _db_status.replica_lost = False
+    return wrapper
+
+def remember(key, value, refresh):
+    """Keep a good DB result as the stale fallback for ``key``."""
+    return stale_cache.put(key, value, refresh)
+
+def stale_or_fallback(key, fallback):
+    """Last good result for ``key`` if the DB was unavailable, else ``fallback``."""
+    if getattr(_db_status, 'replica_lost', False):
+        return fallback  # discarded: retry_on_primary runs the helper again
+    if getattr(_db_status, 'unavailable', False):
+        cached = stale_cache.get(key)
+        if cached is not None:
+            value, age = cached
+            if has_request_context():
+                g.stale_age = max(age, g.get('stale_age', 0))
+            metrics.fallback_hits.inc(key[0], 'stale_cache')
+            return value
+    metrics.fallback_hits.inc(key[0], 'fallback_data')
+    return fallback
+
+@db_breaker.on_close
+def refresh_stale_reads():
+    threading.Thread(target=stale_cache.refresh_served, name='stale-refresh', daemon=True).start()
+
+@app.after_request
+def pin_reads_after_write(response):
+    # Read-your-writes: after a write reached the primary (not merely a
+    # POST such as /batch), this technician's reads use the primary for a while
+    if g.get('wrote_primary') and response.status_code < 400:
+        token = db_router.pin(current_session())
+        if token:
+            response.set_cookie(DB_PIN_COOKIE, token, max_age=int(db_router.pin_seconds) + 1,
+                                httponly=True, secure=request.is_secure, samesite='Strict')
+            response.headers[DB_PIN_HEADER] = token
+    return response
+
+@app.after_request
+def mark_stale_response(response):
+    if has_request_context() and 'stale_age' in g:
+        response.headers['Warning'] = '110 - "Response is Stale"'
+        response.headers['X-Data-Stale-Seconds'] = str(int(g.stale_age))
+    return response
+
+# Notification read marks are written before the response; marks the DB could
+# not take are retried in the background (see notification_state.ReadStateWriter).
+read_state = ReadStateWriter(get_db_connection, flush_interval=int(os.getenv('NOTIFICATION_FLUSH_MS', 500)) / 1000)
+app.extensions['read_state'] = read_state
 
 # JWT utilities
 def create_access_token(data):
@@ -101,8 +344,13 @@ def create_access_token(data):
     return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
 
 def verify_token(token):
+    # /batch verifies its token once; sub-requests carrying it reuse the result
+    if has_request_context() and token and g.get('verified_token') == token:
+        return g.verified_payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        if has_request_context():
+            g.current_user = payload
         return payload
     except:
         return None
@@ -122,6 +370,68 @@ def token_required(f):
             return jsonify({'error': 'Authentication failed'}), 401
     return decorated
 
+# ==================== IDEMPOTENCY ====================
+# Authenticated write requests carrying an Idempotency-Key header run once;
+# retries with the same key get the stored response (Idempotent-Replayed: true)
+# and concurrent duplicates wait for the first execution.
+idempotency_store = idempotency.IdempotencyStore(
+    ttl=int(os.getenv('IDEMPOTENCY_TTL_SECONDS', 86400)),
+    max_entries=int(os.getenv('IDEMPOTENCY_MAX_ENTRIES', 10000)),
+    wait_timeout=float(os.getenv('IDEMPOTENCY_WAIT_SECONDS', 10)),
+    # Also claim keys in the idempotency_keys table (shared by all workers)
+    # Key bookkeeping is not data the technician reads back, so it does not pin reads
+    connect=partial(get_db_connection, pin_reads=False) if os.getenv('IDEMPOTENCY_DB', 'false').lower() == 'true' else None
+)
+
+def request_fingerprint():
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.full_path}\n".encode('utf-8'))
+    digest.update(request.get_data(cache=True))
+    return digest.hexdigest()
+
+@app.before_request
+def replay_idempotent_request():
+    key = request.headers.get('Idempotency-Key')
+    if not key or request.method not in WRITE_METHODS:
+        return None
+    if len(key) > 255:
+        return jsonify({"error": "Idempotency-Key must be at most 255 characters"}), 400
+    authorization = request.headers.get('Authorization', '')
+    payload = verify_token(authorization[7:]) if authorization.startswith('Bearer ') else None
+    if not payload:
+        # Unauthenticated writes are not deduplicated; the endpoint handles auth
+        return None
+    scope = str(payload.get('sub'))
+    outcome, stored = idempotency_store.begin(scope, key, request_fingerprint())
+    if outcome == idempotency.REPLAY:
+        status_code, content_type, body = stored
+        response = app.response_class(body, status=status_code, content_type=content_type)
+        response.headers['Idempotent-Replayed'] = 'true'
+        return response
+    if outcome == idempotency.MISMATCH:
+        return jsonify({"error": "Idempotency-Key was already used for a different request"}), 422
+    if outcome == idempotency.IN_PROGRESS:
+        return jsonify({"error": "A request with this Idempotency-Key is still in progress"}), 409, {'Retry-After': '1'}
+    g.idempotency_claim = (scope, key)
+    return None
+
+@app.after_request
+def store_idempotent_response(response):
+    claim = g.pop('idempotency_claim', None)
+    if claim is not None:
+        # Server errors are not stored, so the client's retry runs again
+        if response.status_code >= 500 or response.is_streamed:
+            idempotency_store.abandon(*claim)
+        else:
+            idempotency_store.complete(*claim, response.status_code, response.content_type, response.get_data())
+    return response
+
+@app.teardown_request
+def release_idempotency_claim(exc):
+    claim = g.pop('idempotency_claim', None)
+    if claim is not None:
+        idempotency_store.abandon(*claim)
+
 # ==================== MODELS ====================
 # Auth Models
 login_model = api.model('Login', {
@@ -173,6 +483,20 @@ profile_update_model = api.model('ProfileUpdate', {
     'specializations': fields.List(fields.String, required=False, description='Technical specializations')
 })
 
+# Batch Models
+batch_item_model = api.model('BatchItem', {
+    'method': fields.String(required=False, description='HTTP method (only GET is supported)', default='GET', example='GET'),
+    'path': fields.String(required=True, description='Path including query string', example='/dashboard/')
+})
+
+batch_model = api.model('Batch', {
+    'requests': fields.List(fields.Nested(batch_item_model), required=True, description='Sub-requests, answered in order', example=[
+        {'method': 'GET', 'path': '/dashboard/'},
+        {'method': 'GET', 'path': '/notifications/unread-count'},
+        {'method': 'GET', 'path': '/profile/'}
+    ])
+})
+
 # Inventory Models
 inventory_request_model = api.model('InventoryRequest', {
     'parts': fields.List(fields.Raw, required=True, description='Parts to request', example=[
@@ -207,63 +531,506 @@ FALLBACK_DATA = {
     ]
 }
 
+def _freeze(value):
+    return tuple(value) if isinstance(value, list) else value
+
+def batch_memo(f):
+    """Reuse a data helper's result for identical calls within one /batch request.
+
+    Outside /batch (no ``g.batch_memo``) every call goes through as before.
+    Arguments are bound to the signature first, so ``f(1)`` and
+    ``f(1, fields=None)`` share an entry.
+    """
+    signature = inspect.signature(f)
+    
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        memo = g.get('batch_memo') if has_request_context() else None
+        if memo is None:
+            return f(*args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (f.__name__,) + tuple(_freeze(v) for v in bound.arguments.values())
+        if key not in memo:
+            memo[key] = f(*args, **kwargs)
+        return memo[key]
+    return wrapper
+
 # Helper functions - Updated for Aiven database schema
+# Rows are fetched with a plain cursor and converted through a per-query
+# column plan (see serializers.RowSerializer) instead of per-cell checks.
+@batch_memo
+@retry_on_primary
+@metrics.track_query('technician')
 def get_technician_data(technician_id):
-    with get_db_connection() as conn:
+    key = ("technician", int(technician_id))
+    with get_db_connection(read_only=True) as conn:
         if conn:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
+            cursor = conn.cursor()
             cursor.execute("SELECT * FROM technicians WHERE id = %s", (technician_id,))
-            result = cursor.fetchone()
+            result = fetch_dict(cursor)
             cursor.close()
             if result:
-                if result.get('specializations'):
-                    import json
-                    result['specializations'] = json.loads(result['specializations'])
-                return result
-    return FALLBACK_DATA["technicians"][0]
+                return remember(key, result, lambda: get_technician_data(technician_id))
+    return stale_or_fallback(key, FALLBACK_DATA["technicians"][0])
+
+# Sparse fieldsets: public ticket field -> SELECT expression
+TICKET_FIELDS = {
+    "id": "st.id",
+    "ticket_number": "st.ticket_number",
+    "status": "st.status",
+    "priority": "st.priority",
+    "scheduled_date": "st.scheduled_date",
+    "completed_at": "st.completed_at",
+    "created_at": "st.created_at",
+    "product_name": "st.product_name",
+    "product_model": "st.product_model",
+    "issue_description": "st.issue_description",
+    "customer_id": "st.customer_id",
+    "assigned_staff_id": "st.assigned_staff_id",
+    "customer_name": "c.name",
+    "customer_phone": "c.phone",
+    "customer_address": "c.address"
+}
+
+def requested_ticket_fields():
+    """Parse the ``fields=`` query parameter; ``None`` means every column."""
+    raw = request.args.get('fields')
+    if not raw:
+        return None
+    fields = list(dict.fromkeys(f.strip() for f in raw.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in TICKET_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    if "id" not in fields:
+        fields.insert(0, "id")
+    return fields
+
+def ticket_query_fields(fields, *required):
+    """Fields to SELECT: the requested ones plus those the endpoint itself reads."""
+    if fields is None:
+        return None
+    return fields + [f for f in required if f not in fields]
+
+def ticket_list(tickets, fields, compact=False):
+    """Shape a ticket list for output: projected dicts or compact rows."""
+    if compact:
+        return to_compact(tickets, fields)
+    return project_rows(tickets, fields)
+
+def wants_compact():
+    return request.args.get('format') == 'compact'
 
-def get_technician_tickets(technician_id, status=None):
-    with get_db_connection() as conn:
+@batch_memo
+@retry_on_primary
+@metrics.track_query('technician_tickets')
+def get_technician_tickets(technician_id, status=None, fields=None):
+    key = ("tickets", int(technician_id), status, tuple(fields) if fields else None)
+    with get_db_connection(read_only=True) as conn:
         if conn:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
-            query = "SELECT st.*, c.name as customer_name, c.phone as customer_phone, c.address as customer_address FROM service_tickets st LEFT JOIN customers c ON st.customer_id = c.id WHERE st.assigned_staff_id = %s"
+            cursor = conn.cursor()
+            if fields is None:
+                columns = "st.*, c.name as customer_name, c.phone as customer_phone, c.address as customer_address"
+            else:
+                columns = ", ".join(f"{TICKET_FIELDS[f]} as {f}" for f in fields)
+            query = f"SELECT {columns} FROM service_tickets st LEFT JOIN customers c ON st.customer_id = c.id WHERE st.assigned_staff_id = %s"
             params = [technician_id]
             if status:
                 query += " AND st.status = %s"
                 params.append(status.upper())
             try:
                 cursor.execute(query, params)
-                results = cursor.fetchall()
+                results = fetch_dicts(cursor)
                 cursor.close()
                 if results:
-                    # Convert datetime objects to strings for JSON serialization
-                    for result in results:
-                        for key, value in result.items():
-                            if hasattr(value, 'isoformat'):
-                                result[key] = value.isoformat()
-                    return results
+                    return remember(key, results, lambda: get_technician_tickets(technician_id, status, fields))
             except Exception as e:
                 print(f"Database query error: {e}")
                 cursor.close()
-    return [t for t in FALLBACK_DATA["tickets"] if t["assigned_technician_id"] == int(technician_id)]
+                if is_db_unavailable_error(e):
+                    mark_db_unavailable()
+    tickets = [t for t in FALLBACK_DATA["tickets"] if t["assigned_technician_id"] == int(technician_id)]
+    return stale_or_fallback(key, project_rows(tickets, fields))
 
+@batch_memo
+@retry_on_primary
+@metrics.track_query('technician_notifications')
 def get_technician_notifications(technician_id):
-    with get_db_connection() as conn:
+    key = ("notifications", int(technician_id))
+    with get_db_connection(read_only=True) as conn:
         if conn:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
+            cursor = conn.cursor()
             cursor.execute("SELECT * FROM notifications WHERE user_id = %s ORDER BY created_at DESC", (technician_id,))
-            results = cursor.fetchall()
+            results = fetch_dicts(cursor)
             cursor.close()
             if results:
-                # Convert datetime objects to strings for JSON serialization
-                for result in results:
-                    for key, value in result.items():
-                        if hasattr(value, 'isoformat'):
-                            result[key] = value.isoformat()
-                return results
-    return [n for n in FALLBACK_DATA["notifications"] if n["technician_id"] == int(technician_id)]
+                return read_state.apply(int(technician_id), remember(key, results, lambda: get_technician_notifications(technician_id)))
+    notifications = stale_or_fallback(key, [n for n in FALLBACK_DATA["notifications"] if n["technician_id"] == int(technician_id)])
+    return read_state.apply(int(technician_id), notifications)
 
+# Related ticket data is resolved per entity type with one IN (...) query for
+# all the tickets involved, and cached for the request (see loaders.BatchLoader).
+TICKET_RELATIONS = ("parts_used", "photos", "service_history")
+SERVICE_HISTORY_LIMIT = 10
 
+@retry_on_primary
+def fetch_in(query, keys, *params):
+    """Run ``query`` with ``{keys}`` expanded to one placeholder per key; ``None`` if the DB is unavailable.
+
+    ``params`` fill any placeholders that follow ``{keys}``.
+    """
+    with get_db_connection(read_only=True) as conn:
+        if not conn:
+            return None
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query.format(keys=", ".join(["%s"] * len(keys))), list(keys) + list(params))
+            return fetch_dicts(cursor)
+        except Exception as e:
+            print(f"Database query error: {e}")
+            if is_db_unavailable_error(e):
+                mark_db_unavailable()
+            return None
+        finally:
+            cursor.close()
+
+def load_tickets_by_id(ticket_ids, technician_id):
+    """Tickets by id, limited to those assigned to ``technician_id``."""
+    rows = fetch_in(
+        "SELECT st.*, c.name as customer_name, c.phone as customer_phone, c.address as customer_address "
+        "FROM service_tickets st LEFT JOIN customers c ON st.customer_id = c.id "
+        "WHERE st.id IN ({keys}) AND st.assigned_staff_id = %s",
+        ticket_ids, technician_id
+    )
+    return None if rows is None else {row["id"]: row for row in rows}
+
+def load_parts_by_ticket(ticket_ids):
+    rows = fetch_in("SELECT ticket_id, part_id, name, quantity, cost FROM ticket_parts WHERE ticket_id IN ({keys}) ORDER BY id", ticket_ids)
+    if rows is None:
+        return None
+    return {
+        ticket_id: [{k: v for k, v in part.items() if k != "ticket_id"} for part in parts]
+        for ticket_id, parts in group_by(rows, "ticket_id").items()
+    }
+
+def load_photos_by_ticket(ticket_ids):
+    rows = fetch_in("SELECT ticket_id, url FROM ticket_photos WHERE ticket_id IN ({keys}) ORDER BY id", ticket_ids)
+    if rows is None:
+        return None
+    return {ticket_id: [photo["url"] for photo in photos] for ticket_id, photos in group_by(rows, "ticket_id").items()}
+
+def load_history_by_customer(customer_ids):
+    """Each customer's latest completed tickets, limited per customer in SQL.
+
+    One row more than SERVICE_HISTORY_LIMIT, as the ticket being viewed is
+    left out of its own history.
+    """
+    rows = fetch_in(
+        "SELECT id, ticket_number, customer_id, product_name, assigned_staff_id, completed_at FROM ("
+        "SELECT id, ticket_number, customer_id, product_name, assigned_staff_id, completed_at, "
+        "ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY completed_at DESC, id DESC) AS history_rank "
+        "FROM service_tickets WHERE customer_id IN ({keys}) AND status = 'COMPLETED'"
+        ") ranked WHERE history_rank <= %s ORDER BY completed_at DESC, id DESC",
+        customer_ids, SERVICE_HISTORY_LIMIT + 1
+    )
+    return None if rows is None else group_by(rows, "customer_id")
+
+def load_technician_names(technician_ids):
+    rows = fetch_in("SELECT id, full_name FROM technicians WHERE id IN ({keys})", technician_ids)
+    return None if rows is None else {row["id"]: row["full_name"] for row in rows}
+
+def ticket_loaders():
+    """BatchLoaders for tickets and their related entities, one set per request.
+
+    The tickets loader only returns the requesting technician's tickets.
+    """
+    loaders = g.get('ticket_loaders') if has_request_context() else None
+    if loaders is None:
+        technician_id = current_session()
+        technician_id = int(technician_id) if technician_id is not None else None
+        loaders = {
+            "tickets": BatchLoader(lambda ticket_ids: load_tickets_by_id(ticket_ids, technician_id)),
+            "parts_used": BatchLoader(load_parts_by_ticket, list),
+            "photos": BatchLoader(load_photos_by_ticket, list),
+            "service_history": BatchLoader(load_history_by_customer, list),
+            "technician_names": BatchLoader(load_technician_names),
+        }
+        if has_request_context():
+            g.ticket_loaders = loaders
+    return loaders
+
+def requested_relations():
+    """Parse the ``include=`` query parameter into TICKET_RELATIONS names."""
+    raw = request.args.get('include')
+    if not raw:
+        return []
+    include = list(dict.fromkeys(r.strip() for r in raw.split(',') if r.strip()))
+    unknown = [r for r in include if r not in TICKET_RELATIONS]
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(unknown)}")
+    return include
+
+def attach_ticket_relations(tickets, include):
+    """Copies of ``tickets`` with the ``include`` relations embedded.
+
+    Keys from every ticket are collected first, so each relation costs one
+    query however many tickets there are.
+    """
+    loaders = ticket_loaders()
+    ticket_ids = [t["id"] for t in tickets]
+    parts = loaders["parts_used"].load_many(ticket_ids) if "parts_used" in include else {}
+    photos = loaders["photos"].load_many(ticket_ids) if "photos" in include else {}
+    histories, names = {}, {}
+    if "service_history" in include:
+        histories = loaders["service_history"].load_many(t.get("customer_id") for t in tickets)
+        names = loaders["technician_names"].load_many(
+            h["assigned_staff_id"] for rows in histories.values() for h in rows
+        )
+    result = []
+    for ticket in tickets:
+        ticket = dict(ticket)
+        if "parts_used" in include:
+            ticket["parts_used"] = parts.get(ticket["id"], [])
+        if "photos" in include:
+            ticket["photos"] = photos.get(ticket["id"], [])
+        if "service_history" in include:
+            history = [h for h in histories.get(ticket.get("customer_id"), []) if h["id"] != ticket["id"]]
+            ticket["service_history"] = [
+                {
+                    "date": (h["completed_at"] or "")[:10],
+                    "type": "service",
+                    "ticket_number": h["ticket_number"],
+                    "product_name": h["product_name"],
+                    "technician": names.get(h["assigned_staff_id"])
+                } for h in history[:SERVICE_HISTORY_LIMIT]
+            ]
+        result.append(ticket)
+    return result
+
+def load_ticket_details(ticket_ids):
+    """Full ticket detail for any number of ids; ``None`` when the DB is unavailable."""
+    ticket_ids = list(dict.fromkeys(ticket_ids))
+    tickets = ticket_loaders()["tickets"].load_many(ticket_ids)
+    if len(tickets) < len(ticket_ids):
+        return None
+    details = attach_ticket_relations([tickets[i] for i in ticket_ids if tickets[i]], TICKET_RELATIONS)
+    for ticket in details:
+        # Not stored yet; kept so the response shape matches the fallback one
+        for field in ("customer_email", "product_serial", "warranty_status", "work_performed", "customer_signature"):
+            ticket.setdefault(field, None)
+    return {ticket["id"]: ticket for ticket in details}
+
+# ==================== HOME VIEWS ====================
+# Dashboard, DashboardOverview and Profile are rendered from the technician
+# row, a summary of their tickets and their unread count. Each technician's
+# plain (no fields/format) views are kept in home_snapshots, the dashboard and
+# overview as JSON bytes, and only the invalidated parts are reloaded after a
+# write.
+PERFORMANCE_SUMMARY = {
+    "avg_resolution_time": "2.5 hours",
+    "customer_rating": 4.7,
+    "completion_rate": 95.5,
+    "on_time_percentage": 92.3
+}
+
+def ticket_summary(tickets):
+    """What the home views derive from a technician's tickets, as of now."""
+    current = datetime.now()
+    today, now = current.strftime('%Y-%m-%d'), current.isoformat()
+    scheduled = [t for t in tickets if t["status"] == "SCHEDULED"]
+    # Date-dependent counts change at midnight or when a scheduled ticket falls overdue
+    midnight = (datetime.strptime(today, '%Y-%m-%d') + timedelta(days=1)).isoformat()
+    upcoming = [t["scheduled_date"] for t in scheduled if (t.get("scheduled_date") or "") >= now]
+    return {
+        "stats": {
+            "total_tickets": len(tickets),
+            "pending_tickets": len(scheduled),
+            "in_progress_tickets": len([t for t in tickets if t["status"] == "IN_PROGRESS"]),
+            "completed_tickets": len([t for t in tickets if t["status"] == "COMPLETED"]),
+            "completed_today": len([t for t in tickets if t["status"] == "COMPLETED" and (t.get("completed_at") or "").startswith(today)])
+        },
+        "assigned_tickets": {
+            "total": len(tickets),
+            "high_priority": len([t for t in tickets if t.get("priority") == "HIGH"]),
+            "medium_priority": len([t for t in tickets if t.get("priority") == "MEDIUM"]),
+            "low_priority": len([t for t in tickets if t.get("priority") == "LOW"]),
+            "overdue": len([t for t in scheduled if (t.get("scheduled_date") or now) < now])
+        },
+        "today_schedule": [t for t in tickets if (t.get("scheduled_date") or "").startswith(today)],
+        "recent_tickets": tickets[:5],
+        "recent_activity": tickets[-3:] if tickets else [],
+        "valid_until": min([midnight] + upcoming)
+    }
+
+def dashboard_view(technician, summary, recent_tickets):
+    return {
+        "technician": technician,
+        "stats": summary["stats"],
+        "recent_tickets": recent_tickets,
+        "performance": PERFORMANCE_SUMMARY
+    }
+
+def overview_view(technician, summary, unread):
+    return {
+        "technician_info": technician,
+        "assigned_tickets": summary["assigned_tickets"],
+        "today_schedule": summary["today_schedule"],
+        "unread_notifications": unread,
+        "recent_activity": summary["recent_activity"]
+    }
+
+def profile_view(technician, summary, **extra):
+    profile_data = technician.copy()
+    profile_data.update({
+        "department": "Field Service",
+        "join_date": "2020-01-15",
+        "performance_rating": 4.8,
+        "completed_tickets_total": summary["stats"]["completed_tickets"],
+        "certification_level": "Senior Technician"
+    }, **extra)
+    return {"profile": profile_data}
+
+def unread_count(notifications):
+    return len([n for n in notifications if not n["is_read"]])
+
+def live_only(helper, derive):
+    """Snapshot loader: ``derive(helper(id))``, or ``None`` if the DB was unavailable."""
+    # Call past batch_memo so the DB status seen is that of this call
+    helper = getattr(helper, '__wrapped__', helper)
+
+    def load(technician_id):
+        value = helper(technician_id)
+        return None if getattr(_db_status, 'unavailable', False) else derive(value)
+    return load
+
+def render_home_view(view, snapshot):
+    technician, summary = snapshot.technician, snapshot.tickets
+    if view == "dashboard":
+        return dumps(dashboard_view(technician, summary, summary["recent_tickets"]))
+    if view == "overview":
+        return dumps(overview_view(technician, summary, snapshot.notifications))
+    # Kept as a dict: Profile adds the per-request last_login before encoding
+    return profile_view(technician, summary)["profile"]
+
+home_snapshots = SnapshotStore(
+    {
+        "technician": live_only(get_technician_data, lambda technician: technician),
+        "tickets": live_only(get_technician_tickets, ticket_summary),
+        "notifications": live_only(get_technician_notifications, unread_count)
+    },
+    {
+        "dashboard": ("technician", "tickets"),
+        "overview": ("technician", "tickets", "notifications"),
+        "profile": ("technician", "tickets")
+    },
+    render_home_view,
+    dated={"tickets": lambda summary: summary["valid_until"]},
+    ttl=float(os.getenv('HOME_SNAPSHOT_TTL_SECONDS', 30)),
+    max_entries=int(os.getenv('HOME_SNAPSHOT_MAX_ENTRIES', 5000))
+)
+HOME_SNAPSHOTS_ENABLED = os.getenv('HOME_SNAPSHOTS_ENABLED', 'true').lower() == 'true'
+
+def home_snapshot(technician_id, view):
+    """Rendered plain view, or ``None`` to build it the normal way."""
+    if not HOME_SNAPSHOTS_ENABLED or request.args:
+        return None
+    return home_snapshots.get(technician_id, view)
+
+def json_bytes_response(body):
+    response = make_response(body, 200)
+    response.mimetype = 'application/json'
+    return response
+
+# ==================== METRICS ====================
+@metrics.registry.register_collector
+def collect_runtime_stats():
+    pool = connection_pool.stats()
+    yield 'db_pool_connections', 'gauge', 'Pooled DB connections by state', [
+        ({"state": "idle"}, pool["idle"]), ({"state": "in_use"}, pool["in_use"])
+    ]
+    yield 'db_pool_checkouts_total', 'counter', 'Pool checkouts by outcome', [
+        ({"outcome": "created"}, pool["created"]), ({"outcome": "reused"}, pool["reused"])
+    ]
+    breaker = db_breaker.stats()
+    yield 'db_circuit_state', 'gauge', 'DB circuit breaker state (1 = current)', [
+        ({"state": state}, int(breaker["state"] == state))
+        for state in (CircuitBreaker.CLOSED, CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN)
+    ]
+    yield 'db_circuit_rejected_total', 'counter', 'DB calls short-circuited while open', [({}, breaker["rejected_calls"])]
+    cache = stale_cache.stats()
+    yield 'stale_cache_entries', 'gauge', 'Entries in the stale read cache', [({}, cache["entries"])]
+    yield 'stale_cache_cells', 'gauge', 'Row fields held in the stale read cache', [({}, cache["cells"])]
+    yield 'stale_cache_lookups_total', 'counter', 'Stale cache lookups by result', [
+        ({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])
+    ]
+    routing = db_router.stats()
+    yield 'db_replica_healthy', 'gauge', 'Replica in rotation (1) or skipped (0)', [
+        ({"replica": r["name"]}, int(r["healthy"])) for r in routing["replicas"]
+    ]
+    yield 'db_replica_lag_seconds', 'gauge', 'Replication lag at the last health check', [
+        ({"replica": r["name"]}, r["lag_seconds"]) for r in routing["replicas"] if r["lag_seconds"] is not None
+    ]
+    yield 'db_reads_routed_total', 'counter', 'Read-only queries by destination', [
+        ({"target": r["name"]}, r["routed_reads"]) for r in routing["replicas"]
+    ] + [
+        ({"target": "primary_pinned"}, routing["pinned_reads"]),
+        ({"target": "primary_no_healthy_replica"}, routing["no_replica_reads"])
+    ]
+    keys = idempotency_store.stats()
+    yield 'idempotency_keys', 'gauge', 'Idempotency keys held in process by state', [
+        ({"state": "in_flight"}, keys["in_flight"]), ({"state": "stored"}, keys["entries"] - keys["in_flight"])
+    ]
+    yield 'idempotent_requests_total', 'counter', 'Keyed write requests by outcome', [
+        ({"outcome": "executed"}, keys["executions"]), ({"outcome": "replayed"}, keys["replays"]),
+        ({"outcome": "waited"}, keys["waits"])
+    ]
+    snapshots = home_snapshots.stats()
+    yield 'home_snapshots', 'gauge', 'Technician home snapshots held in process', [({}, snapshots["entries"])]
+    yield 'home_snapshot_requests_total', 'counter', 'Home view requests served from a snapshot vs rebuilt', [
+        ({"result": "hit"}, snapshots["hits"]), ({"result": "rebuilt"}, snapshots["builds"]),
+        ({"result": "unavailable"}, snapshots["unavailable"])
+    ]
+    yield 'home_snapshot_invalidations_total', 'counter', 'Snapshot parts invalidated by writes', [({}, snapshots["invalidations"])]
+    writes = read_state.stats()
+    yield 'notification_read_pending', 'gauge', 'Notification read marks waiting to be flushed', [
+        ({"kind": "ids"}, writes["pending_ids"]), ({"kind": "mark_all"}, writes["pending_mark_all"])
+    ]
+    yield 'notification_read_writes_total', 'counter', 'Read marks received vs UPDATE statements issued', [
+        ({"kind": "marks"}, writes["marks"]), ({"kind": "statements"}, writes["statements"])
+    ]
+    compression = compressor.stats()
+    yield 'compression_bytes_total', 'counter', 'Bytes before/after response compression', [
+        ({"endpoint": endpoint, "direction": direction}, entry[f"bytes_{direction}"])
+        for endpoint, entry in compression.items() for direction in ("in", "out")
+    ]
+    yield 'compression_cpu_seconds_total', 'counter', 'Thread CPU time spent compressing', [
+        ({"endpoint": endpoint}, entry["cpu_seconds"]) for endpoint, entry in compression.items()
+    ]
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text exposition (per worker process)"""
+    return metrics.registry.render(), 200, {'Content-Type': metrics.CONTENT_TYPE}
+
+# ==================== DEBUG ====================
+@app.route('/debug/queries')
+def debug_queries():
+    """Top statements by total time, with EXPLAIN for slow ones (DEBUG_ENDPOINTS=true only)"""
+    if os.getenv('DEBUG_ENDPOINTS', 'false').lower() != 'true':
+        return jsonify({"error": "Not found"}), 404
+    try:
+        limit = int(request.args.get('limit', 20))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1:
+        return jsonify({"error": "limit must be at least 1"}), 400
+    order_by = request.args.get('order_by', 'total_ms')
+    if order_by not in ('total_ms', 'avg_ms', 'max_ms', 'calls', 'slow_calls', 'errors', 'rows'):
+        return jsonify({"error": "Invalid order_by"}), 400
+    return jsonify({
+        "slow_query_threshold_ms": query_profiler.threshold_ms,
+        "queries": query_profiler.top(limit, order_by)
+    })
 
 # ==================== AUTHENTICATION ENDPOINTS ====================
 @auth_ns.route('/login')
@@ -358,6 +1125,8 @@ class Dashboard(Resource):
     @dashboard_ns.doc('get_dashboard', security='Bearer')
     @dashboard_ns.response(200, 'Dashboard data retrieved')
     @dashboard_ns.response(401, 'Unauthorized')
+    @dashboard_ns.param('fields', 'Comma-separated ticket fields for recent_tickets')
+    @dashboard_ns.param('format', 'Use "compact" for column header plus row arrays', enum=['compact'])
     def get(self):
         """Get technician dashboard overview"""
         # Check for authorization header first
@@ -370,27 +1139,20 @@ class Dashboard(Resource):
         if not payload:
             return {'error': 'Invalid or expired token'}, 401
         
+        try:
+            fields = requested_ticket_fields()
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        
         technician_id = int(payload.get('sub', 1))
+        body = home_snapshot(technician_id, 'dashboard')
+        if body is not None:
+            return json_bytes_response(body)
         technician = get_technician_data(technician_id)
-        tickets = get_technician_tickets(technician_id)
+        tickets = get_technician_tickets(technician_id, fields=ticket_query_fields(fields, "status", "completed_at"))
+        summary = ticket_summary(tickets)
         
-        return {
-            "technician": technician,
-            "stats": {
-                "total_tickets": len(tickets),
-                "pending_tickets": len([t for t in tickets if t["status"] == "SCHEDULED"]),
-                "in_progress_tickets": len([t for t in tickets if t["status"] == "IN_PROGRESS"]),
-                "completed_tickets": len([t for t in tickets if t["status"] == "COMPLETED"]),
-                "completed_today": len([t for t in tickets if t["status"] == "COMPLETED" and t.get("completed_at", "").startswith(datetime.now().strftime('%Y-%m-%d'))])
-            },
-            "recent_tickets": tickets[:5],
-            "performance": {
-                "avg_resolution_time": "2.5 hours",
-                "customer_rating": 4.7,
-                "completion_rate": 95.5,
-                "on_time_percentage": 92.3
-            }
-        }
+        return dashboard_view(technician, summary, ticket_list(summary["recent_tickets"], fields, wants_compact()))
 
 @dashboard_ns.route('/overview')
 class DashboardOverview(Resource):
@@ -408,23 +1170,14 @@ class DashboardOverview(Resource):
             return {'error': 'Invalid or expired token'}, 401
         
         technician_id = int(payload.get('sub', 1))
+        body = home_snapshot(technician_id, 'overview')
+        if body is not None:
+            return json_bytes_response(body)
         technician = get_technician_data(technician_id)
         tickets = get_technician_tickets(technician_id)
         notifications = get_technician_notifications(technician_id)
         
-        return {
-            "technician_info": technician,
-            "assigned_tickets": {
-                "total": len(tickets),
-                "high_priority": len([t for t in tickets if t["priority"] == "HIGH"]),
-                "medium_priority": len([t for t in tickets if t["priority"] == "MEDIUM"]),
-                "low_priority": len([t for t in tickets if t["priority"] == "LOW"]),
-                "overdue": len([t for t in tickets if t["status"] == "SCHEDULED" and t["scheduled_date"] < datetime.now().isoformat()])
-            },
-            "today_schedule": [t for t in tickets if t["scheduled_date"].startswith(datetime.now().strftime('%Y-%m-%d'))],
-            "unread_notifications": len([n for n in notifications if not n["is_read"]]),
-            "recent_activity": tickets[-3:] if tickets else []
-        }
+        return overview_view(technician, ticket_summary(tickets), unread_count(notifications))
 
 # ==================== TICKETS ENDPOINTS ====================
 @tickets_ns.route('/assigned')
@@ -434,6 +1187,9 @@ class AssignedTickets(Resource):
     @tickets_ns.param('priority', 'Filter by priority', enum=['LOW', 'MEDIUM', 'HIGH', 'URGENT'])
     @tickets_ns.param('limit', 'Number of tickets to return', type=int, default=10)
     @tickets_ns.param('offset', 'Number of tickets to skip', type=int, default=0)
+    @tickets_ns.param('fields', 'Comma-separated ticket fields to return (e.g. id,ticket_number,status)')
+    @tickets_ns.param('include', 'Comma-separated related data to embed: parts_used, photos, service_history')
+    @tickets_ns.param('format', 'Use "compact" for column header plus row arrays', enum=['compact'])
     @api.doc(security='Bearer')
     @token_required
     def get(self, current_user):
@@ -443,17 +1199,27 @@ class AssignedTickets(Resource):
         priority = request.args.get('priority')
         limit = int(request.args.get('limit', 10))
         offset = int(request.args.get('offset', 0))
+        try:
+            fields = requested_ticket_fields()
+            include = requested_relations()
+        except ValueError as e:
+            return {"error": str(e)}, 400
         
-        tickets = get_technician_tickets(technician_id, status)
+        required = (["priority"] if priority else []) + (["customer_id"] if "service_history" in include else [])
+        query_fields = ticket_query_fields(fields, *required)
+        tickets = get_technician_tickets(technician_id, status, query_fields)
         
         if priority:
             tickets = [t for t in tickets if t["priority"].lower() == priority.lower()]
         
         total_count = len(tickets)
         tickets = tickets[offset:offset + limit]
+        if include:
+            tickets = attach_ticket_relations(tickets, include)
+            fields = fields + include if fields else fields
         
         return {
-            "tickets": tickets,
+            "tickets": ticket_list(tickets, fields, wants_compact()),
             "total_count": total_count,
             "limit": limit,
             "offset": offset
@@ -464,6 +1230,7 @@ class CompletedTickets(Resource):
     @tickets_ns.doc('get_completed_tickets', security='Bearer')
     @tickets_ns.param('limit', 'Number of tickets to return', type=int, default=10)
     @tickets_ns.param('offset', 'Number of tickets to skip', type=int, default=0)
+    @tickets_ns.param('include', 'Comma-separated related data to embed: parts_used, photos, service_history')
     @api.doc(security='Bearer')
     @token_required
     def get(self, current_user):
@@ -471,10 +1238,16 @@ class CompletedTickets(Resource):
         technician_id = int(current_user.get('sub', 1))
         limit = int(request.args.get('limit', 10))
         offset = int(request.args.get('offset', 0))
+        try:
+            include = requested_relations()
+        except ValueError as e:
+            return {"error": str(e)}, 400
         
         tickets = get_technician_tickets(technician_id, 'COMPLETED')
         total_count = len(tickets)
         tickets = tickets[offset:offset + limit]
+        if include:
+            tickets = attach_ticket_relations(tickets, include)
         
         return {
             "tickets": tickets,
@@ -489,8 +1262,16 @@ class TicketDetail(Resource):
     @api.doc(security='Bearer')
     @token_required
     def get(self, ticket_id, current_user):
-        """Get detailed ticket information"""
-        ticket = next((t for t in FALLBACK_DATA["tickets"] if t["id"] == ticket_id), None)
+        """Get detailed ticket information (only tickets assigned to the technician)"""
+        details = load_ticket_details([ticket_id])
+        if details is not None:
+            if ticket_id not in details:
+                return {"error": "Ticket not found"}, 404
+            return {"ticket": details[ticket_id]}
+        
+        # Database unavailable: serve the sample data
+        technician_id = int(current_user.get('sub', 1))
+        ticket = next((t for t in FALLBACK_DATA["tickets"] if t["id"] == ticket_id and t["assigned_technician_id"] == technician_id), None)
         if not ticket:
             return {"error": "Ticket not found"}, 404
         
@@ -527,6 +1308,7 @@ class UpdateTicketStatus(Resource):
         notes = data.get('notes', '')
         work_performed = data.get('work_performed', '')
         parts_used = data.get('parts_used', [])
+        home_snapshots.invalidate(int(current_user.get('sub', 1)), 'tickets')
         
         return {
             "message": "Ticket status updated successfully",
@@ -653,6 +1435,11 @@ class MarkNotificationRead(Resource):
     @token_required
     def put(self, notification_id, current_user):
         """Mark notification as read"""
+        technician_id = int(current_user.get('sub', 1))
+        if not read_state.mark_read(technician_id, notification_id):
+            # Deferred: pin this technician's reads so they follow the retried write
+            g.wrote_primary = True
+        home_snapshots.invalidate(technician_id, 'notifications')
         return {
             "message": f"Notification {notification_id} marked as read",
             "notification_id": notification_id,
@@ -680,9 +1467,14 @@ class MarkAllRead(Resource):
     def put(self, current_user):
         """Mark all notifications as read"""
         technician_id = int(current_user.get('sub', 1))
+        marked_count = read_state.mark_all_read(technician_id)
+        if marked_count is None:
+            g.wrote_primary = True
+        home_snapshots.invalidate(technician_id, 'notifications')
         return {
             "message": "All notifications marked as read",
             "technician_id": technician_id,
+            "marked_count": marked_count,
             "marked_at": datetime.now().isoformat()
         }
 
@@ -724,12 +1516,19 @@ class Schedule(Resource):
 class WeeklySchedule(Resource):
     @schedule_ns.doc('get_weekly_schedule', security='Bearer')
     @schedule_ns.param('week_start', 'Week start date in YYYY-MM-DD format')
+    @schedule_ns.param('fields', 'Comma-separated ticket fields to return per day')
+    @schedule_ns.param('format', 'Use "compact" for column header plus row arrays', enum=['compact'])
     @api.doc(security='Bearer')
     @token_required
     def get(self, current_user):
         """Get technician weekly schedule"""
         technician_id = int(current_user.get('sub', 1))
-        tickets = get_technician_tickets(technician_id)
+        try:
+            fields = requested_ticket_fields()
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        compact = wants_compact()
+        tickets = get_technician_tickets(technician_id, fields=ticket_query_fields(fields, "scheduled_date"))
         
         # Group tickets by date
         weekly_schedule = {}
@@ -740,7 +1539,7 @@ class WeeklySchedule(Resource):
                 "date": date,
                 "day_name": (datetime.now() + timedelta(days=i)).strftime('%A'),
                 "appointments": len(day_tickets),
-                "tickets": day_tickets
+                "tickets": ticket_list(day_tickets, fields, compact)
             }
         
         return {"weekly_schedule": weekly_schedule}
@@ -754,20 +1553,14 @@ class Profile(Resource):
     def get(self, current_user):
         """Get technician profile"""
         technician_id = int(current_user.get('sub', 1))
+        last_login = datetime.now().isoformat()
+        profile = home_snapshot(technician_id, 'profile')
+        if profile is not None:
+            return {"profile": dict(profile, last_login=last_login)}
         technician = get_technician_data(technician_id)
         tickets = get_technician_tickets(technician_id)
         
-        profile_data = technician.copy()
-        profile_data.update({
-            "department": "Field Service",
-            "join_date": "2020-01-15",
-            "performance_rating": 4.8,
-            "completed_tickets_total": len([t for t in tickets if t["status"] == "COMPLETED"]),
-            "certification_level": "Senior Technician",
-            "last_login": datetime.now().isoformat()
-        })
-        
-        return {"profile": profile_data}
+        return profile_view(technician, ticket_summary(tickets), last_login=last_login)
     
     @profile_ns.expect(profile_update_model)
     @profile_ns.doc('update_profile', security='Bearer')
@@ -776,6 +1569,7 @@ class Profile(Resource):
     def put(self, current_user):
         """Update technician profile"""
         data = request.get_json()
+        home_snapshots.invalidate(int(current_user.get('sub', 1)), 'technician')
         return {
             "message": "Profile updated successfully",
             "updated_fields": list(data.keys()),
@@ -884,7 +1678,7 @@ class InventoryRequest(Resource):
         
         return {
             "message": "Parts request submitted successfully",
-            "request_id": f"REQ{datetime.now().strftime('%Y%m%d%H%M%S')}",
+            "request_id": f"REQ{datetime.now().strftime('%Y%m%d%H%M%S')}{uuid.uuid4().hex[:6].upper()}",
             "technician_id": technician_id,
             "parts_requested": len(parts),
             "estimated_delivery": (datetime.now() + timedelta(days=2)).strftime('%Y-%m-%d'),
@@ -919,10 +1713,136 @@ class InventoryRequests(Resource):
             "total_count": len(requests)
         }
 
+# ==================== BATCH ENDPOINT ====================
+MAX_BATCH_REQUESTS = int(os.getenv('MAX_BATCH_REQUESTS', 10))
+
+def dispatch_batch_item(item, authorization):
+    """Run one GET sub-request through the URL map; returns (status, JSON body bytes).
+
+    The view is called directly inside a nested request context, so the
+    before/after request hooks (metrics, compression, CORS) only run once
+    for the enclosing /batch request.
+    """
+    method = str(item.get('method') or 'GET').upper()
+    path = item.get('path')
+    if not isinstance(path, str) or not path.startswith('/'):
+        return 400, dumps({"error": "path must be an absolute path"})
+    if method != 'GET':
+        return 405, dumps({"error": "Only GET sub-requests are supported"})
+    if path.split('?', 1)[0].rstrip('/') == '/batch':
+        return 400, dumps({"error": "Nested batch requests are not allowed"})
+    headers = {'Authorization': authorization}
+    pin_token = request_pin_token()
+    if pin_token:
+        headers[DB_PIN_HEADER] = pin_token
+    with app.test_request_context(path, method=method, headers=headers, base_url=request.host_url):
+        if request.routing_exception is not None:
+            code = getattr(request.routing_exception, 'code', 404)
+            return code, dumps({"error": "Not found" if code == 404 else request.routing_exception.name})
+        try:
+            response = make_response(app.view_functions[request.url_rule.endpoint](**request.view_args))
+        except HTTPException as e:
+            # abort() and friends: the same status and body as the direct GET
+            response = api.handle_error(e)
+        except Exception:
+            app.logger.exception("Batch sub-request %s failed", path)
+            return 500, dumps({"message": "Internal Server Error"})
+        body = response.get_data()
+        if not response.is_json:
+            body = dumps(body.decode('utf-8', 'replace'))
+        return response.status_code, body.strip() or b'null'
+
+@api.route('/batch')
+class Batch(Resource):
+    @api.expect(batch_model)
+    @api.doc('batch', security='Bearer')
+    @api.response(200, 'Sub-responses in request order')
+    @api.response(400, 'Invalid batch')
+    @api.response(401, 'Unauthorized')
+    def post(self):
+        """Run several GET requests in one round trip (e.g. the app-launch screens)"""
+        authorization = request.headers.get('Authorization')
+        if not authorization or not authorization.startswith('Bearer '):
+            return {'error': 'Token required'}, 401
+        payload = verify_token(authorization[7:])
+        if not payload:
+            return {'error': 'Invalid or expired token'}, 401
+        
+        data = request.get_json(silent=True) or {}
+        items = data.get('requests')
+        if not isinstance(items, list) or not items:
+            return {"error": "requests must be a non-empty list"}, 400
+        if len(items) > MAX_BATCH_REQUESTS:
+            return {"error": f"At most {MAX_BATCH_REQUESTS} requests per batch"}, 400
+        if not all(isinstance(item, dict) for item in items):
+            return {"error": "Each request must be an object with a path"}, 400
+        
+        # Shared by every sub-request: the verified token and the data helper memo
+        g.verified_token = authorization[7:]
+        g.verified_payload = payload
+        g.batch_memo = {}
+        
+        # Sub-responses are already JSON, so splice them instead of re-encoding
+        parts = []
+        for item in items:
+            status, body = dispatch_batch_item(item, authorization)
+            parts.append(b'{"path":' + dumps(item.get('path')) + b',"status":' + str(status).encode() + b',"body":' + body + b'}')
+        response = make_response(b'{"responses":[' + b','.join(parts) + b']}', 200)
+        response.mimetype = 'application/json'
+        return response
+
+# ==================== STARTUP ====================
+# Import only builds routes and models; the Swagger spec is generated by
+# Flask-RESTX on the first /docs/ (swagger.json) hit, and the URL matcher and
+# DB connections are prepared by warm_up() in the background once the server
+# is listening.
+def warm_up():
+    """Build the route matcher and pre-open pooled DB connections ahead of the first technician request."""
+    started = time.perf_counter()
+    # Werkzeug compiles the URL matcher on the first bind (a few ms); the
+    # first JSON encode initialises the encoder
+    with app.test_request_context('/health'):
+        dumps(FALLBACK_DATA["tickets"])
+    db_router.start()
+    opened = connection_pool.warm()
+    print(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.0f} ms ({opened} DB connections)")
+
+def start_warm_up():
+    if os.getenv('WARMUP_ON_START', 'true').lower() == 'true':
+        threading.Thread(target=warm_up, name='warm-up', daemon=True).start()
+
+app.extensions['warm_up'] = start_warm_up
+
+def serve(config_path=None):
+    """Run the app under gunicorn using gunicorn.conf.py (see that file for the worker model)."""
+    from gunicorn.app.base import Application
+
+    config_path = config_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gunicorn.conf.py')
+
+    class ServiceApplication(Application):
+        def load_config(self):
+            self.load_config_from_file(config_path)
+            self.chdir()
+
+        def load(self):
+            return app
+
+    ServiceApplication().run()
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 8002))
     debug_mode = os.getenv('FLASK_ENV') == 'development'
     print(f"🚀 Starting Ostrich Service Technician API on port {port}")
     print(f"📚 Swagger UI available at: http://0.0.0.0:{port}/docs/")
     print(f"🔧 Test credentials: username='demo.tech', password='password123'")
-    app.run(host='0.0.0.0', port=port, debug=debug_mode)
\ No newline at end of file
+    if debug_mode or '--dev' in sys.argv:
+        start_warm_up()
+        app.run(host='0.0.0.0', port=port, debug=debug_mode)
+    else:
+        try:
+            serve()
+        except ImportError:
+            # gunicorn is POSIX-only; fall back to the threaded dev server
+            print("gunicorn not available, using the Flask development server")
+            start_warm_up()
+            app.run(host='0.0.0.0', port=port, threaded=True)
\ No newline at end of file
@@ -0,0 +1,227 @@
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from flask import g, request
+
+# Prometheus default latency buckets (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+ROW_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class Registry:
+    """Metric registry with per-thread shards.
+
+    Recording only touches the calling thread's own dict, so the hot path
+    takes no lock; shards are merged when :meth:`render` is scraped. Shards
+    of threads that have exited (per-request threads of the dev server,
+    background refreshes) are folded into one base shard so their number
+    stays bounded by the live threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._base = {}
+        self._shards = []   # (owning thread, shard)
+        self._metrics = []
+        self._collectors = []
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._fold_exited()
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def _fold_exited(self):
+        """Merge shards of exited threads into the base shard (lock held)."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            for key, value in shard.items():
+                self._base[key] = key[0]._merge(self._base.get(key), value)
+        self._shards = live
+
+    def counter(self, name, help, labelnames=()):
+        return self._add(Counter(self, name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._add(Histogram(self, name, help, labelnames, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """``collector()`` yields ``(name, type, help, [(labels_dict, value), ...])`` at scrape time."""
+        self._collectors.append(collector)
+        return collector
+
+    def _merged(self, metric):
+        with self._lock:
+            self._fold_exited()
+            shards = [dict(self._base)] + [shard for _, shard in self._shards]
+        merged = {}
+        for shard in shards:
+            for (owner, labels), value in list(shard.items()):
+                if owner is metric:
+                    merged[labels] = metric._merge(merged.get(labels), value)
+        return merged
+
+    def render(self):
+        """Prometheus text exposition of every metric and collector."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for labels, value in sorted(self._merged(metric).items()):
+                lines.extend(metric._render(labels, value))
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    names = sorted(labels)
+                    lines.append(f"{name}{_labels(names, [labels[n] for n in names])} {_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, registry, name, help, labelnames):
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def inc(self, *labels, amount=1):
+        shard = self._registry._shard()
+        key = (self, labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    @staticmethod
+    def _merge(total, value):
+        return value if total is None else total + value
+
+    def _render(self, labels, value):
+        return [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"]
+
+
+class Histogram:
+    type = 'histogram'
+
+    def __init__(self, registry, name, help, labelnames, buckets):
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        shard = self._registry._shard()
+        key = (self, labels)
+        entry = shard.get(key)
+        if entry is None:
+            # one slot per bucket, one for +Inf, then the running sum
+            entry = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        entry[bisect_left(self.buckets, value)] += 1
+        entry[-1] += value
+
+    @staticmethod
+    def _merge(total, value):
+        if total is None:
+            return list(value)
+        return [a + b for a, b in zip(total, value)]
+
+    def _render(self, labels, entry):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), entry):
+            cumulative += count
+            le = f'le="{_number(float(bound))}"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(entry[-1])}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+# ==================== DEFAULT METRICS ====================
+registry = Registry()
+
+request_latency = registry.histogram(
+    'http_request_duration_seconds', 'Request latency by route', ('route', 'method', 'status'))
+response_size = registry.histogram(
+    'http_response_size_bytes', 'Uncompressed response body size by route', ('route',), SIZE_BUCKETS)
+query_latency = registry.histogram(
+    'db_query_duration_seconds', 'Data helper latency (including fallback paths)', ('query',))
+query_rows = registry.histogram(
+    'db_query_rows', 'Rows returned by data helpers', ('query',), ROW_BUCKETS)
+fallback_hits = registry.counter(
+    'data_fallback_total', 'Reads served from stale cache or FALLBACK_DATA instead of the DB', ('dataset', 'source'))
+
+
+def init_app(app):
+    """Time every request and record its response size."""
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            rule = request.url_rule
+            route = rule.rule if rule is not None else 'unmatched'
+            request_latency.observe(time.perf_counter() - started, route, request.method, response.status_code)
+            if not response.is_streamed:
+                response_size.observe(response.content_length or 0, route)
+        return response
+
+
+def track_query(name):
+    """Decorator recording latency and row count of a data helper."""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            result = f(*args, **kwargs)
+            query_latency.observe(time.perf_counter() - started, name)
+            query_rows.observe(len(result) if isinstance(result, list) else int(result is not None), name)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,225 @@
+import threading
+import time
+
+
+class ReadStateWriter:
+    """Writes notification read marks as set-based UPDATEs.
+
+    Both marks are written before the request returns, so every worker
+    process reads the new state from the database: :meth:`mark_read`
+    writes the technician's pending ids as one
+    ``UPDATE ... WHERE user_id = %s AND id IN (...)`` and
+    :meth:`mark_all_read` runs a single
+    ``UPDATE ... WHERE user_id = %s AND is_read = 0``. Marks that cannot
+    be written (DB down) stay pending, coalesced per technician, and a
+    background thread retries them every ``flush_interval`` seconds.
+
+    In this process :meth:`apply` also overlays recent marks on rows read
+    from a lagging replica, the stale cache or the fallback data. A
+    mark-all covers the notifications up to the highest id the database
+    had when it ran (all of them while it is still pending).
+
+    ``connect`` is a context manager yielding a connection or ``None``
+    (``main.get_db_connection``).
+    """
+
+    def __init__(self, connect, flush_interval=0.5, max_ids_per_statement=500, overlay_ttl=300.0,
+                 clock=time.monotonic):
+        self._connect = connect
+        self.flush_interval = flush_interval
+        self.max_ids_per_statement = max_ids_per_statement
+        self.overlay_ttl = overlay_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = {}        # technician_id -> {notification_id}
+        self._pending_all = set()  # technician_ids with a mark-all not yet written
+        self._read = {}           # technician_id -> {notification_id: marked_at}, pending or recently flushed
+        self._read_all = {}       # technician_id -> (highest id covered or None while pending, marked_at)
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._stopped = False
+        self.marks = 0
+        self.statements = 0
+        self.failed_flushes = 0
+
+    # ----- writes -----
+    def mark_read(self, technician_id, notification_id):
+        """Record a mark and write it now; returns ``False`` if it was deferred (DB unavailable)."""
+        now = self._clock()
+        with self._lock:
+            self._pending.setdefault(technician_id, set()).add(notification_id)
+            self._read.setdefault(technician_id, {})[notification_id] = now
+            self.marks += 1
+            ids = self._pending.pop(technician_id)
+        if self._write_pending(technician_id, ids):
+            return True
+        self._ensure_thread()
+        return False
+
+    def mark_all_read(self, technician_id):
+        """Mark every unread notification read; returns the updated row count, or ``None`` if deferred."""
+        with self._lock:
+            self._read_all[technician_id] = (None, self._clock())
+            # Anything still pending for this technician is covered by the statement below
+            self._pending.pop(technician_id, None)
+        updated = self._write_all(technician_id)
+        if updated is None:
+            with self._lock:
+                self._pending_all.add(technician_id)
+            self._ensure_thread()
+        return updated
+
+    def _write_all(self, technician_id):
+        try:
+            with self._connect() as conn:
+                if not conn:
+                    return None
+                cursor = conn.cursor()
+                # The overlay covers exactly the rows the UPDATE can touch (ids from the DB, not the app clock)
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM notifications WHERE user_id = %s", (technician_id,))
+                last_id = cursor.fetchone()[0]
+                cursor.execute(
+                    "UPDATE notifications SET is_read = 1 WHERE user_id = %s AND is_read = 0 AND id <= %s",
+                    (technician_id, last_id)
+                )
+                updated = cursor.rowcount
+                cursor.close()
+                conn.commit()
+        except Exception as e:
+            print(f"Mark-all-read failed for technician {technician_id}: {e}")
+            return None
+        with self._lock:
+            self.statements += 1
+            self._read_all[technician_id] = (last_id, self._clock())
+        return updated
+
+    def flush(self):
+        """Write pending marks now; returns the number of technicians whose marks were written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                pending_all, self._pending_all = self._pending_all, set()
+            written = 0
+            for technician_id in pending_all:
+                if self._write_all(technician_id) is None:
+                    with self._lock:
+                        self._pending_all.add(technician_id)
+                    continue
+                written += 1
+                pending.pop(technician_id, None)
+            for technician_id, ids in pending.items():
+                written += self._write_pending(technician_id, ids)
+            self._expire_overlay()
+            return written
+
+    def _write_pending(self, technician_id, ids):
+        """One UPDATE per ``max_ids_per_statement`` ids; unwritten ids go back to pending."""
+        ids = sorted(ids)
+        for start in range(0, len(ids), self.max_ids_per_statement):
+            if not self._write_ids(technician_id, ids[start:start + self.max_ids_per_statement]):
+                self._requeue(technician_id, ids[start:])
+                return False
+        return True
+
+    def _write_ids(self, technician_id, ids):
+        placeholders = ', '.join(['%s'] * len(ids))
+        try:
+            with self._connect() as conn:
+                if not conn:
+                    return False
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"UPDATE notifications SET is_read = 1 WHERE user_id = %s AND id IN ({placeholders})",
+                    [technician_id] + ids
+                )
+                cursor.close()
+                conn.commit()
+        except Exception as e:
+            print(f"Notification read flush failed for technician {technician_id}: {e}")
+            return False
+        with self._lock:
+            self.statements += 1
+        return True
+
+    def _requeue(self, technician_id, ids):
+        with self._lock:
+            self._pending.setdefault(technician_id, set()).update(ids)
+            self.failed_flushes += 1
+
+    def _expire_overlay(self):
+        """Forget marks that were flushed more than ``overlay_ttl`` seconds ago."""
+        expire_before = self._clock() - self.overlay_ttl
+        with self._lock:
+            for technician_id in list(self._read):
+                pending = self._pending.get(technician_id, ())
+                marks = {
+                    notification_id: marked_at
+                    for notification_id, marked_at in self._read[technician_id].items()
+                    if marked_at >= expire_before or notification_id in pending
+                }
+                if marks:
+                    self._read[technician_id] = marks
+                else:
+                    del self._read[technician_id]
+            for technician_id, (_, marked_at) in list(self._read_all.items()):
+                if marked_at < expire_before and technician_id not in self._pending_all:
+                    del self._read_all[technician_id]
+
+    # ----- reads -----
+    def apply(self, technician_id, notifications):
+        """Return ``notifications`` with this technician's marks applied (rows are copied, not mutated)."""
+        with self._lock:
+            read_ids = self._read.get(technician_id)
+            read_all = self._read_all.get(technician_id)
+        if not read_ids and not read_all:
+            return notifications
+        last_id = read_all[0] if read_all else None
+        result = []
+        for notification in notifications:
+            if not notification.get("is_read") and (
+                    (read_ids and notification.get("id") in read_ids)
+                    or (read_all and (last_id is None or (notification.get("id") or 0) <= last_id))):
+                notification = dict(notification, is_read=True)
+            result.append(notification)
+        return result
+
+    # ----- background flushing -----
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._stopped or (self._thread is not None and self._thread.is_alive()):
+                return
+            # Started lazily so each (forked) worker process gets its own thread
+            self._thread = threading.Thread(target=self._run, name='notification-read-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._wakeup.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Notification read flush failed: {e}")
+        self.flush()
+
+    def close(self):
+        """Stop the flush thread after writing whatever is pending."""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None:
+            thread.join(timeout=10)
+        else:
+            self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending_ids": sum(len(ids) for ids in self._pending.values()),
+                "pending_mark_all": len(self._pending_all),
+                "marks": self.marks,
+                "statements": self.statements,
+                "failed_flushes": self.failed_flushes
+            }
@@ -0,0 +1,162 @@
+import hashlib
+import re
+import threading
+import time
+
+import pymysql.cursors
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\([^)]+\)s")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES\s*(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ('select', 'update', 'delete', 'insert', 'replace')
+
+
+def normalize_sql(sql):
+    """Replace literals and placeholders with ``?`` so similar statements group together."""
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', 'replace')
+    sql = _STRING.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (?+)', sql)
+    sql = _VALUES_LIST.sub(r'VALUES \1+', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint(normalized):
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def params_fingerprint(args):
+    """Shape of the bound parameters (count and types), never their values."""
+    if args is None:
+        return 'none'
+    if isinstance(args, dict):
+        return 'dict:' + ','.join(f"{k}={type(v).__name__}" for k, v in sorted(args.items()))
+    if isinstance(args, (list, tuple)):
+        return ','.join(type(v).__name__ for v in args) or 'empty'
+    return type(args).__name__
+
+
+class QueryProfiler:
+    """Aggregates statement timings by fingerprint and logs slow ones.
+
+    The first time a fingerprint exceeds ``threshold_ms`` its ``EXPLAIN``
+    is captured on the same connection and kept with the stats. Statements
+    that raise (read timeouts, lock waits, deadlocks) are recorded too,
+    with their error, but never EXPLAINed.
+    """
+
+    def __init__(self, threshold_ms=200, max_fingerprints=500, explain=True):
+        self.threshold_ms = threshold_ms
+        self.max_fingerprints = max_fingerprints
+        self.explain = explain
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, cursor, query, args, elapsed_ms, error=None):
+        normalized = normalize_sql(query)
+        key = fingerprint(normalized)
+        rows = 0 if error is not None or cursor.rowcount is None else max(cursor.rowcount, 0)
+        slow = elapsed_ms >= self.threshold_ms
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    # Forget the cheapest statement to make room
+                    cheapest = min(self._stats, key=lambda k: self._stats[k]["total_ms"])
+                    del self._stats[cheapest]
+                entry = self._stats[key] = {
+                    "fingerprint": key,
+                    "sql": normalized,
+                    "calls": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "rows": 0,
+                    "slow_calls": 0,
+                    "errors": 0,
+                    "last_error": None,
+                    "params": {},
+                    "explain": None
+                }
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            entry["rows"] += rows
+            if error is not None:
+                entry["errors"] += 1
+                entry["last_error"] = str(error)
+            needs_explain = False
+            if slow:
+                entry["slow_calls"] += 1
+                shape = params_fingerprint(args)
+                if shape in entry["params"] or len(entry["params"]) < 10:
+                    entry["params"][shape] = entry["params"].get(shape, 0) + 1
+                needs_explain = self.explain and error is None and entry["explain"] is None
+                if needs_explain:
+                    entry["explain"] = []  # claim it so concurrent calls don't repeat the EXPLAIN
+        if not slow:
+            return
+        outcome = f"failed: {error}" if error is not None else f"{rows} rows"
+        print(f"Slow query ({elapsed_ms:.1f} ms, {outcome}, params {params_fingerprint(args)}) [{key}]: {normalized}")
+        if needs_explain:
+            plan = self._explain(cursor, query, args)
+            with self._lock:
+                if key in self._stats:
+                    self._stats[key]["explain"] = plan
+
+    @staticmethod
+    def _explain(cursor, query, args):
+        statement = query.decode('utf-8', 'replace') if isinstance(query, bytes) else query
+        if not statement.lstrip().lower().startswith(_EXPLAINABLE):
+            return None
+        connection = cursor.connection
+        # The profiled cursor has already buffered its result, so a second
+        # (unprofiled) cursor can safely run on the same connection.
+        explain_cursor = connection.cursor(pymysql.cursors.DictCursor)
+        try:
+            explain_cursor.execute("EXPLAIN " + statement, args)
+            return [dict(row) for row in explain_cursor.fetchall()]
+        except Exception as e:
+            return [{"error": str(e)}]
+        finally:
+            explain_cursor.close()
+
+    def top(self, limit=20, order_by="total_ms"):
+        with self._lock:
+            entries = [dict(entry, params=dict(entry["params"])) for entry in self._stats.values()]
+        for entry in entries:
+            entry["avg_ms"] = round(entry["total_ms"] / entry["calls"], 3) if entry["calls"] else 0.0
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+        entries.sort(key=lambda entry: entry[order_by], reverse=True)
+        return entries[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+profiler = QueryProfiler()
+
+
+class ProfiledCursor(pymysql.cursors.Cursor):
+    """Plain cursor that reports every ``execute`` to :data:`profiler`."""
+
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        error = None
+        try:
+            return super().execute(query, args)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            profiler.record(self, query, args, (time.perf_counter() - started) * 1000, error)
+
+
+class ProfiledDictCursor(pymysql.cursors.DictCursorMixin, ProfiledCursor):
+    """DictCursor variant of :class:`ProfiledCursor`."""
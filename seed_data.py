@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""Synthetic data generator and bulk loader for scale testing.
+
+Generates technicians, customers, service tickets (with the parts used
+and photos recorded on them), notifications and an inventory catalogue
+with tunable distributions, deterministically from --seed, and bulk-loads
+them into a local MySQL (batched multi-row executemany, or LOAD DATA LOCAL
+INFILE from a streamed temp file) or into the embedded sqlite stand-in
+(fakedb.py).
+
+Examples:
+    # local MySQL container (docker run -e MYSQL_ROOT_PASSWORD=pw -p 3306:3306 mysql:8)
+    python seed_data.py --host 127.0.0.1 --user root --password pw --database ostrich \\
+        --create-schema --truncate --method load-data
+
+    # embedded stand-in, small run
+    python seed_data.py --sqlite /tmp/ostrich.db --technicians 200 --tickets 50000 \\
+        --notifications 50000 --parts 10000 --truncate
+
+Never point this at the production database: --truncate empties the tables.
+"""
+import argparse
+import bisect
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pymysql
+
+STATUSES = ('SCHEDULED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED')
+PRIORITIES = ('LOW', 'MEDIUM', 'HIGH', 'URGENT')
+SPECIALIZATIONS = ('Motors', 'Pumps', 'Generators', 'Electrical', 'Compressors', 'Controls', 'Bearings')
+PRODUCTS = (
+    ('1HP Motor', 'OST-1HP-SP'), ('3HP Motor', 'OST-3HP-SP'), ('5HP Motor', 'OST-5HP-TP'),
+    ('2HP Pump', 'OST-2HP-MP'), ('5HP Pump', 'OST-5HP-MP'), ('10HP Pump', 'OST-10HP-SB'),
+    ('5KVA Generator', 'OST-5K-GN'), ('7HP Generator', 'OST-7HP-GN'), ('15KVA Generator', 'OST-15K-GN'),
+)
+ISSUES = (
+    'Motor not starting properly', 'Pump maintenance required', 'Generator overheating issue',
+    'Abnormal vibration', 'Low output pressure', 'Tripping on overload', 'Oil leakage', 'Annual service',
+)
+CITIES = ('Mumbai', 'Delhi', 'Bangalore', 'Chennai', 'Hyderabad', 'Pune', 'Kolkata', 'Ahmedabad', 'Jaipur', 'Surat')
+FIRST_NAMES = ('John', 'Jane', 'Bob', 'Asha', 'Ravi', 'Priya', 'Arjun', 'Meera', 'Vikram', 'Neha', 'Sanjay', 'Anita')
+LAST_NAMES = ('Customer', 'Smith', 'Wilson', 'Sharma', 'Patel', 'Iyer', 'Reddy', 'Gupta', 'Khan', 'Das', 'Rao', 'Nair')
+NOTIFICATION_TYPES = (
+    ('assignment', 'New Ticket Assigned', 'Ticket {ticket} has been assigned to you'),
+    ('urgent', 'Urgent Ticket', 'High priority ticket {ticket} needs immediate attention'),
+    ('schedule', 'Schedule Update', 'Your schedule for tomorrow has been updated'),
+    ('reminder', 'Appointment Reminder', 'Visit for ticket {ticket} starts in one hour'),
+)
+PART_CATEGORIES = ('Bearings', 'Electrical', 'Filters', 'Belts', 'Seals', 'Impellers', 'Capacitors', 'Fasteners')
+LOCATIONS = ('Van Inventory', 'Warehouse', 'Regional Hub', 'Supplier')
+
+COLUMNS = {
+    'technicians': ('id', 'employee_id', 'full_name', 'email', 'phone', 'role', 'specializations', 'experience_years'),
+    'customers': ('id', 'name', 'phone', 'address'),
+    'service_tickets': (
+        'id', 'ticket_number', 'customer_id', 'customer_name', 'customer_phone', 'customer_address',
+        'product_name', 'product_model', 'issue_description', 'status', 'priority', 'assigned_staff_id',
+        'scheduled_date', 'completed_at', 'created_at'
+    ),
+    'notifications': ('id', 'user_id', 'title', 'message', 'type', 'is_read', 'ticket_id', 'created_at'),
+    'inventory': ('id', 'part_number', 'name', 'category', 'quantity_available', 'unit_cost', 'location'),
+    'ticket_parts': ('id', 'ticket_id', 'part_id', 'name', 'quantity', 'cost'),
+    'ticket_photos': ('id', 'ticket_id', 'url'),
+}
+# Load order respects the references between tables
+LOAD_ORDER = ('technicians', 'customers', 'service_tickets', 'notifications', 'inventory', 'ticket_parts', 'ticket_photos')
+
+
+# ==================== DISTRIBUTIONS ====================
+def parse_mix(text, keys):
+    """'A=0.5,B=0.5' -> cumulative weights aligned with ``keys``."""
+    weights = dict.fromkeys(keys, 0.0)
+    for item in text.split(','):
+        key, _, value = item.partition('=')
+        key = key.strip().upper()
+        if key not in weights:
+            raise argparse.ArgumentTypeError(f"Unknown value {key!r}, expected one of {', '.join(keys)}")
+        weights[key] = float(value)
+    if not any(weights.values()):
+        raise argparse.ArgumentTypeError("At least one weight must be positive")
+    return list(itertools.accumulate(weights[key] for key in keys))
+
+
+class WeightedPicker:
+    """O(log n) weighted choice over a fixed population."""
+
+    def __init__(self, population, cumulative):
+        self.population = population
+        self.cumulative = cumulative
+        self.total = cumulative[-1]
+
+    def pick(self, rng):
+        return self.population[bisect.bisect_right(self.cumulative, rng.random() * self.total)]
+
+
+def skewed_picker(count, skew, rng):
+    """Pick ids 1..count with Zipf-like skew (0 = uniform); the busiest ids are shuffled."""
+    ids = list(range(1, count + 1))
+    rng.shuffle(ids)
+    weights = [1.0 / (rank ** skew) for rank in range(1, count + 1)]
+    return WeightedPicker(ids, list(itertools.accumulate(weights)))
+
+
+# ==================== GENERATORS ====================
+def technicians(args):
+    rng = random.Random(f"{args.seed}:technicians")
+    for i in range(1, args.technicians + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        specs = rng.sample(SPECIALIZATIONS, rng.randint(1, 3))
+        yield (
+            i, f"EMP{i:06d}", f"{first} {last}", f"{first.lower()}.{last.lower()}{i}@ostrich.com",
+            f"9{rng.randrange(10 ** 9):09d}", 'technician', json.dumps(specs), rng.randint(0, 25)
+        )
+
+
+def customer_fields(customer_id, seed):
+    """Name, phone and address of a customer, derived from its id alone.
+
+    Tickets copy these into their denormalised customer columns, so they
+    must be reproducible without keeping every customer in memory.
+    """
+    rng = random.Random(f"{seed}:customer:{customer_id}")
+    return (
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"8{rng.randrange(10 ** 9):09d}",
+        f"{rng.randint(1, 999)} {rng.choice(('Main St', 'Service Ave', 'Repair Rd', 'Market Rd'))}, {rng.choice(CITIES)}"
+    )
+
+
+def customers(args):
+    for i in range(1, args.customers + 1):
+        yield (i,) + customer_fields(i, args.seed)
+
+
+def service_tickets(args):
+    rng = random.Random(f"{args.seed}:service_tickets")
+    assignees = skewed_picker(args.technicians, args.assignee_skew, rng)
+    statuses = WeightedPicker(STATUSES, args.status_mix)
+    priorities = WeightedPicker(PRIORITIES, args.priority_mix)
+    span = (args.days_back + args.days_ahead) * 86400
+    start = args.now - timedelta(days=args.days_back)
+    for i in range(1, args.tickets + 1):
+        customer_id = rng.randint(1, args.customers)
+        name, phone, address = customer_fields(customer_id, args.seed)
+        product, model = rng.choice(PRODUCTS)
+        status = statuses.pick(rng)
+        # Work hours only, on 30-minute slots
+        scheduled = start + timedelta(seconds=rng.randrange(span))
+        scheduled = scheduled.replace(hour=rng.randint(8, 17), minute=rng.choice((0, 30)), second=0, microsecond=0)
+        if status in ('SCHEDULED', 'IN_PROGRESS') and scheduled < args.now - timedelta(days=7):
+            scheduled += timedelta(days=args.days_back)
+        created = scheduled - timedelta(hours=rng.randint(2, 240))
+        completed = scheduled + timedelta(minutes=rng.randint(30, 480)) if status == 'COMPLETED' else None
+        yield (
+            i, f"TKT{i:09d}", customer_id, name, phone, address, product, model, rng.choice(ISSUES),
+            status, priorities.pick(rng), assignees.pick(rng), scheduled, completed, created
+        )
+
+
+def notifications(args):
+    rng = random.Random(f"{args.seed}:notifications")
+    users = skewed_picker(args.technicians, args.assignee_skew, rng)
+    span = args.days_back * 86400
+    for i in range(1, args.notifications + 1):
+        kind, title, message = rng.choice(NOTIFICATION_TYPES)
+        ticket_id = rng.randint(1, args.tickets) if args.tickets and '{ticket}' in message else None
+        created = args.now - timedelta(seconds=rng.randrange(span))
+        # Older notifications are more likely to have been read
+        age_fraction = (args.now - created).total_seconds() / span
+        is_read = rng.random() < min(1.0, args.read_ratio * (0.5 + age_fraction))
+        yield (
+            i, users.pick(rng), title, message.format(ticket=f"TKT{ticket_id or 0:09d}"), kind,
+            int(is_read), ticket_id, created.replace(microsecond=0)
+        )
+
+
+def inventory(args):
+    rng = random.Random(f"{args.seed}:inventory")
+    for i in range(1, args.parts + 1):
+        category = rng.choice(PART_CATEGORIES)
+        yield (
+            i, f"{category[:3].upper()}{i:07d}", f"{category.rstrip('s')} {rng.choice(('A', 'B', 'C', 'X'))}-{i % 997}",
+            category, int(rng.paretovariate(1.5)) - 1, Decimal(rng.randint(500, 500000)) / 100, rng.choice(LOCATIONS)
+        )
+
+
+def ticket_parts(args):
+    rng = random.Random(f"{args.seed}:ticket_parts")
+    for i in range(1, args.ticket_parts + 1):
+        part_id = rng.randint(1, args.parts) if args.parts else None
+        category = rng.choice(PART_CATEGORIES)
+        yield (
+            i, rng.randint(1, args.tickets), part_id, f"{category.rstrip('s')} {rng.choice(('A', 'B', 'C', 'X'))}",
+            rng.choice((1, 1, 1, 2, 2, 4)), Decimal(rng.randint(500, 500000)) / 100
+        )
+
+
+def ticket_photos(args):
+    rng = random.Random(f"{args.seed}:ticket_photos")
+    for i in range(1, args.ticket_photos + 1):
+        ticket_id = rng.randint(1, args.tickets)
+        yield i, ticket_id, f"https://example.com/photos/{ticket_id}_{i}.jpg"
+
+
+GENERATORS = {
+    'technicians': technicians,
+    'customers': customers,
+    'service_tickets': service_tickets,
+    'notifications': notifications,
+    'inventory': inventory,
+    'ticket_parts': ticket_parts,
+    'ticket_photos': ticket_photos,
+}
+
+
+# ==================== LOADING ====================
+class Progress:
+    def __init__(self, table, total, interval=1.0):
+        self.table = table
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.started = self.last = time.perf_counter()
+
+    def advance(self, count):
+        self.done += count
+        now = time.perf_counter()
+        if now - self.last >= self.interval or self.done >= self.total:
+            self.last = now
+            rate = self.done / max(now - self.started, 1e-9)
+            percent = 100.0 * self.done / self.total if self.total else 100.0
+            print(f"  {self.table}: {self.done:,}/{self.total:,} rows ({percent:5.1f}%) {rate:,.0f} rows/s", flush=True)
+
+    def finish(self):
+        elapsed = time.perf_counter() - self.started
+        print(f"PASS: {self.table}: {self.done:,} rows in {elapsed:.1f}s ({self.done / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def batched(rows, size):
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def load_executemany(conn, table, rows, total, batch_size):
+    columns = COLUMNS[table]
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+    progress = Progress(table, total)
+    cursor = conn.cursor()
+    for batch in batched(rows, batch_size):
+        # PyMySQL rewrites INSERT ... VALUES executemany into multi-row INSERTs
+        cursor.executemany(sql, batch)
+        conn.commit()
+        progress.advance(len(batch))
+    cursor.close()
+    progress.finish()
+
+
+def _tsv_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    text = str(value)
+    return text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+
+def load_data_infile(conn, table, rows, total, batch_size):
+    """Stream rows to a temp TSV file in chunks and LOAD DATA LOCAL INFILE each chunk."""
+    columns = COLUMNS[table]
+    progress = Progress(table, total)
+    cursor = conn.cursor()
+    for batch in batched(rows, batch_size):
+        with tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False, encoding='utf-8', newline='\n') as f:
+            for row in batch:
+                f.write('\t'.join(_tsv_value(value) for value in row))
+                f.write('\n')
+            path = f.name
+        try:
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s INTO TABLE {table} CHARACTER SET utf8mb4 "
+                f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({', '.join(columns)})",
+                (path,)
+            )
+            conn.commit()
+        finally:
+            os.unlink(path)
+        progress.advance(len(batch))
+    cursor.close()
+    progress.finish()
+
+
+def connect(args):
+    if args.sqlite:
+        import fakedb
+        conn = fakedb.connect(args.sqlite, autocommit=False)
+        if args.create_schema:
+            fakedb.create_schema(conn)
+        return conn
+    conn = pymysql.connect(
+        host=args.host, port=args.port, user=args.user, password=args.password, database=args.database,
+        charset='utf8mb4', local_infile=args.method == 'load-data', autocommit=False
+    )
+    if args.create_schema:
+        import setup_aiven_db
+        cursor = conn.cursor()
+        cursor.execute("SHOW TABLES")
+        existing = {row[0] for row in cursor.fetchall()}
+        for table, create_sql in setup_aiven_db.REQUIRED_TABLES.items():
+            if table not in existing:
+                cursor.execute(create_sql)
+        cursor.close()
+        setup_aiven_db.run_migrations(conn)
+    return conn
+
+
+def prepare_tables(conn, args, tables):
+    cursor = conn.cursor()
+    for table in tables:
+        if args.truncate:
+            cursor.execute(f"DELETE FROM {table}" if args.sqlite else f"TRUNCATE TABLE {table}")
+        else:
+            cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            if cursor.fetchone()[0]:
+                cursor.close()
+                raise SystemExit(f"FAIL: {table} already has rows; pass --truncate to replace them")
+    conn.commit()
+    cursor.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    volume = parser.add_argument_group('volumes')
+    volume.add_argument('--technicians', type=int, default=2000)
+    volume.add_argument('--customers', type=int, help='default: tickets / 5')
+    volume.add_argument('--tickets', type=int, default=1_000_000)
+    volume.add_argument('--notifications', type=int, default=2_000_000)
+    volume.add_argument('--parts', type=int, default=100_000)
+    volume.add_argument('--ticket-parts', type=int, help='parts-used rows (default: one per ticket)')
+    volume.add_argument('--ticket-photos', type=int, help='photo rows (default: tickets / 2)')
+
+    shape = parser.add_argument_group('distributions')
+    shape.add_argument('--seed', type=int, default=42)
+    shape.add_argument('--now', type=lambda s: datetime.strptime(s, '%Y-%m-%d'),
+                       default=datetime.now().replace(hour=0, minute=0, second=0, microsecond=0),
+                       help='reference date YYYY-MM-DD (default: today)')
+    shape.add_argument('--days-back', type=int, default=365)
+    shape.add_argument('--days-ahead', type=int, default=30)
+    shape.add_argument('--assignee-skew', type=float, default=0.8,
+                       help='Zipf exponent for tickets/notifications per technician (0 = uniform)')
+    shape.add_argument('--status-mix', default='SCHEDULED=0.2,IN_PROGRESS=0.1,COMPLETED=0.65,CANCELLED=0.05')
+    shape.add_argument('--priority-mix', default='LOW=0.25,MEDIUM=0.45,HIGH=0.22,URGENT=0.08')
+    shape.add_argument('--read-ratio', type=float, default=0.85)
+
+    target = parser.add_argument_group('target')
+    target.add_argument('--sqlite', help='load into the embedded stand-in at this path instead of MySQL')
+    target.add_argument('--host', default=os.getenv('SEED_DB_HOST', '127.0.0.1'))
+    target.add_argument('--port', type=int, default=int(os.getenv('SEED_DB_PORT', 3306)))
+    target.add_argument('--user', default=os.getenv('SEED_DB_USER', 'root'))
+    target.add_argument('--password', default=os.getenv('SEED_DB_PASSWORD', ''))
+    target.add_argument('--database', default=os.getenv('SEED_DB_NAME', 'ostrich'))
+    target.add_argument('--method', choices=['executemany', 'load-data'], default='executemany')
+    target.add_argument('--batch-size', type=int, default=5000)
+    target.add_argument('--create-schema', action='store_true', help='create missing tables and run migrations first')
+    target.add_argument('--truncate', action='store_true', help='empty the tables before loading')
+    target.add_argument('--only', nargs='+', choices=LOAD_ORDER, help='load only these tables')
+
+    args = parser.parse_args(argv)
+    args.status_mix = parse_mix(args.status_mix, STATUSES)
+    args.priority_mix = parse_mix(args.priority_mix, PRIORITIES)
+    if args.customers is None:
+        args.customers = max(1, args.tickets // 5)
+    if args.ticket_parts is None:
+        args.ticket_parts = args.tickets
+    if args.ticket_photos is None:
+        args.ticket_photos = args.tickets // 2
+    if args.sqlite and args.method == 'load-data':
+        parser.error("--method load-data needs MySQL; the sqlite stand-in only supports executemany")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    conn = connect(args)
+    tables = args.only or LOAD_ORDER
+    totals = {
+        'technicians': args.technicians, 'customers': args.customers, 'service_tickets': args.tickets,
+        'notifications': args.notifications, 'inventory': args.parts,
+        'ticket_parts': args.ticket_parts, 'ticket_photos': args.ticket_photos
+    }
+    loader = load_data_infile if args.method == 'load-data' else load_executemany
+    target = args.sqlite or f"mysql://{args.user}@{args.host}:{args.port}/{args.database}"
+    print(f"Seeding {target} (seed={args.seed}, method={args.method})")
+    prepare_tables(conn, args, tables)
+    started = time.perf_counter()
+    for table in LOAD_ORDER:
+        if table in tables:
+            loader(conn, table, GENERATORS[table](args), totals[table], args.batch_size)
+    conn.close()
+    print(f"PASS: Seeding finished in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
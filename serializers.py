@@ -0,0 +1,188 @@
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from flask import make_response
+from pymysql.constants import FIELD_TYPE
+
+try:
+    import orjson
+except ImportError:  # optional fast path
+    orjson = None
+
+
+# Columns that hold JSON documents even when stored as TEXT/VARCHAR
+JSON_COLUMNS = frozenset({'specializations'})
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _time_of_day(value):
+    # PyMySQL returns TIME columns as timedelta
+    if isinstance(value, timedelta):
+        seconds = int(value.total_seconds())
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return value.isoformat()
+
+
+def _decimal(value):
+    return float(value)
+
+
+def _json_document(value):
+    if isinstance(value, (str, bytes, bytearray)):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+_TYPE_CONVERTERS = {
+    FIELD_TYPE.DATETIME: _isoformat,
+    FIELD_TYPE.TIMESTAMP: _isoformat,
+    FIELD_TYPE.DATE: _isoformat,
+    FIELD_TYPE.NEWDATE: _isoformat,
+    FIELD_TYPE.TIME: _time_of_day,
+    FIELD_TYPE.DECIMAL: _decimal,
+    FIELD_TYPE.NEWDECIMAL: _decimal,
+    FIELD_TYPE.JSON: _json_document,
+}
+
+
+def _column_converter(column, json_columns):
+    name, type_code = column[0], column[1]
+    if name in json_columns:
+        return _json_document
+    return _TYPE_CONVERTERS.get(type_code)
+
+
+class RowSerializer:
+    """Per-query conversion plan built once from ``cursor.description``.
+
+    Only the columns that need converting (temporal, DECIMAL, JSON) are
+    visited per row; everything else is passed through untouched.
+    """
+
+    __slots__ = ('columns', 'plan')
+
+    def __init__(self, description, json_columns=JSON_COLUMNS):
+        self.columns = tuple(column[0] for column in description)
+        self.plan = tuple(
+            (index, converter)
+            for index, converter in (
+                (index, _column_converter(column, json_columns))
+                for index, column in enumerate(description)
+            )
+            if converter is not None
+        )
+
+    @classmethod
+    def from_cursor(cls, cursor, json_columns=JSON_COLUMNS):
+        return cls(cursor.description or (), json_columns)
+
+    def tuples(self, rows):
+        """Convert tuple rows, returning a list of tuples."""
+        plan = self.plan
+        if not plan:
+            return [tuple(row) for row in rows]
+        out = []
+        append = out.append
+        for row in rows:
+            row = list(row)
+            for index, converter in plan:
+                value = row[index]
+                if value is not None:
+                    row[index] = converter(value)
+            append(tuple(row))
+        return out
+
+    def dicts(self, rows):
+        """Convert tuple rows, returning a list of dicts keyed by column name."""
+        columns = self.columns
+        plan = self.plan
+        out = []
+        append = out.append
+        for row in rows:
+            if plan:
+                row = list(row)
+                for index, converter in plan:
+                    value = row[index]
+                    if value is not None:
+                        row[index] = converter(value)
+            append(dict(zip(columns, row)))
+        return out
+
+    def one(self, row):
+        """Convert a single tuple row (e.g. from ``fetchone``), ``None`` passes through."""
+        if row is None:
+            return None
+        return self.dicts((row,))[0]
+
+
+def fetch_dicts(cursor, json_columns=JSON_COLUMNS):
+    """Fetch every remaining row from a plain cursor as serialized dicts."""
+    return RowSerializer.from_cursor(cursor, json_columns).dicts(cursor.fetchall())
+
+
+def fetch_dict(cursor, json_columns=JSON_COLUMNS):
+    """Fetch one row from a plain cursor as a serialized dict, or ``None``."""
+    return RowSerializer.from_cursor(cursor, json_columns).one(cursor.fetchone())
+
+
+# ==================== SPARSE / COMPACT PAYLOADS ====================
+def project_rows(rows, fields):
+    """Keep only ``fields`` of each row dict; ``None`` keeps every key."""
+    if fields is None:
+        return rows
+    return [{field: row[field] for field in fields if field in row} for row in rows]
+
+
+def to_compact(rows, fields=None):
+    """Column header plus row arrays instead of one dict per row."""
+    if fields is None:
+        columns = {}
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+        fields = list(columns)
+    return {
+        "columns": list(fields),
+        "rows": [[row.get(field) for field in fields] for row in rows]
+    }
+
+
+# ==================== JSON ENCODING ====================
+def _json_default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, timedelta):
+        return _time_of_day(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(data):
+        """Encode ``data`` to JSON bytes (orjson)."""
+        return orjson.dumps(data, default=_json_default, option=_ORJSON_OPTIONS)
+else:
+    _encoder = json.JSONEncoder(separators=(',', ':'), default=_json_default)
+
+    def dumps(data):
+        """Encode ``data`` to JSON bytes (stdlib fallback)."""
+        return _encoder.encode(data).encode('utf-8')
+
+
+def output_json(data, code, headers=None):
+    """Flask-RESTX ``application/json`` representation using :func:`dumps`."""
+    response = make_response(dumps(data), code)
+    response.headers.extend(headers or {})
+    response.mimetype = 'application/json'
+    return response
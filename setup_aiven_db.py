@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import sys
+
 import pymysql
 
 # Aiven Database configuration
@@ -12,6 +14,311 @@ DB_CONFIG = {
     'ssl': {'ssl_mode': 'REQUIRED'}
 }
 
+# Required tables for service API (original shape; MIGRATIONS bring them up to date)
+REQUIRED_TABLES = {
+    'technicians': """
+        CREATE TABLE technicians (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            employee_id VARCHAR(50) UNIQUE,
+            full_name VARCHAR(100),
+            email VARCHAR(100),
+            phone VARCHAR(20),
+            role VARCHAR(50) DEFAULT 'technician',
+            specializations JSON,
+            experience_years INT DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'service_tickets': """
+        CREATE TABLE service_tickets (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            ticket_number VARCHAR(50) UNIQUE,
+            customer_name VARCHAR(100),
+            customer_phone VARCHAR(20),
+            customer_address TEXT,
+            product_name VARCHAR(100),
+            product_model VARCHAR(50),
+            issue_description TEXT,
+            status ENUM('SCHEDULED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED') DEFAULT 'SCHEDULED',
+            priority ENUM('LOW', 'MEDIUM', 'HIGH', 'URGENT') DEFAULT 'MEDIUM',
+            assigned_technician_id INT,
+            scheduled_date DATETIME,
+            completed_at DATETIME NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'notifications': """
+        CREATE TABLE notifications (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            user_id INT,
+            title VARCHAR(200),
+            message TEXT,
+            type VARCHAR(50),
+            is_read BOOLEAN DEFAULT FALSE,
+            ticket_id INT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """,
+    'inventory': """
+        CREATE TABLE inventory (
+            id INT PRIMARY KEY AUTO_INCREMENT,
+            part_number VARCHAR(50) UNIQUE,
+            name VARCHAR(100),
+            category VARCHAR(50),
+            quantity_available INT DEFAULT 0,
+            unit_cost DECIMAL(10,2),
+            location VARCHAR(100),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """
+}
+
+# ==================== MIGRATIONS ====================
+# Versioned, idempotent up-steps recorded in schema_version. Each step checks
+# information_schema before acting, so re-running (or running against a
+# database that was altered by hand) is safe. DDL goes through online_alter()
+# so large tables are altered without blocking the app where MySQL allows it.
+
+# Server errors meaning the requested ALGORITHM/LOCK (or syntax) is unsupported
+ONLINE_DDL_UNSUPPORTED = (1845, 1846, 1064)
+
+# Rows per committed batch when backfilling large tables
+BACKFILL_BATCH_SIZE = 5000
+
+def table_exists(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s",
+        (table,)
+    )
+    return cursor.fetchone() is not None
+
+def column_exists(cursor, table, column):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+        (table, column)
+    )
+    return cursor.fetchone() is not None
+
+def index_exists(cursor, table, index):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.statistics WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s",
+        (table, index)
+    )
+    return cursor.fetchone() is not None
+
+def online_alter(cursor, table, clause, fallback_clause=None):
+    """ALTER TABLE with ALGORITHM=INPLACE, LOCK=NONE, falling back to a plain ALTER.
+
+    ``fallback_clause`` (e.g. older syntax) is tried online too before the
+    blocking ALTER.
+    """
+    for attempt in [clause] + ([fallback_clause] if fallback_clause else []):
+        try:
+            cursor.execute(f"ALTER TABLE {table} {attempt}, ALGORITHM=INPLACE, LOCK=NONE")
+            return
+        except pymysql.err.MySQLError as e:
+            if not e.args or e.args[0] not in ONLINE_DDL_UNSUPPORTED:
+                raise
+            print(f"WARN: Online DDL not available for {table} ({e.args[1]})")
+    print(f"WARN: Using a blocking ALTER for {table}")
+    cursor.execute(f"ALTER TABLE {table} {fallback_clause or clause}")
+
+def column_definition(cursor, table, column):
+    """The column's full definition (type, NULL, DEFAULT, extra, COMMENT) for CHANGE COLUMN."""
+    cursor.execute(
+        "SELECT column_type, is_nullable, column_default, extra, column_comment, collation_name "
+        "FROM information_schema.columns WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s",
+        (table, column)
+    )
+    column_type, nullable, default, extra, comment, collation = cursor.fetchone()
+    escape = cursor.connection.escape
+    parts = [column_type]
+    if collation:
+        parts.append(f"COLLATE {collation}")
+    parts.append("NULL" if nullable == 'YES' else "NOT NULL")
+    if default is not None:
+        expression = 'DEFAULT_GENERATED' in extra or default.upper().startswith('CURRENT_TIMESTAMP')
+        parts.append(f"DEFAULT {default if expression else escape(default)}")
+    extra = extra.replace('DEFAULT_GENERATED', '').strip()
+    if extra:
+        parts.append(extra)
+    if comment:
+        parts.append(f"COMMENT {escape(comment)}")
+    return " ".join(parts)
+
+def align_ticket_assignee_column(cursor):
+    # main.py filters on assigned_staff_id; the original schema called it assigned_technician_id
+    if column_exists(cursor, 'service_tickets', 'assigned_staff_id'):
+        return
+    if column_exists(cursor, 'service_tickets', 'assigned_technician_id'):
+        online_alter(
+            cursor, 'service_tickets',
+            "RENAME COLUMN assigned_technician_id TO assigned_staff_id",
+            # RENAME COLUMN needs MySQL 8.0; CHANGE COLUMN must restate the whole definition
+            "CHANGE COLUMN assigned_technician_id assigned_staff_id "
+            + column_definition(cursor, 'service_tickets', 'assigned_technician_id')
+        )
+    else:
+        online_alter(cursor, 'service_tickets', "ADD COLUMN assigned_staff_id INT NULL")
+
+def add_ticket_customers(cursor):
+    # main.py joins customers on service_tickets.customer_id for the customer fields
+    if not table_exists(cursor, 'customers'):
+        cursor.execute("""
+            CREATE TABLE customers (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                name VARCHAR(100),
+                phone VARCHAR(20),
+                address TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                KEY idx_customers_phone (phone)
+            )
+        """)
+    if not column_exists(cursor, 'service_tickets', 'customer_id'):
+        online_alter(cursor, 'service_tickets', "ADD COLUMN customer_id INT NULL")
+    if column_exists(cursor, 'service_tickets', 'customer_name'):
+        # Backfill from the denormalised ticket columns, one customer per (name, phone),
+        # in primary-key ranges committed separately so row locks stay short
+        cursor.execute("SELECT MIN(id), MAX(id) FROM service_tickets WHERE customer_id IS NULL")
+        first, last = cursor.fetchone()
+        for start in range(first or 0, (last or -1) + 1, BACKFILL_BATCH_SIZE):
+            end = start + BACKFILL_BATCH_SIZE - 1
+            cursor.execute("""
+                INSERT INTO customers (name, phone, address)
+                SELECT st.customer_name, st.customer_phone, MAX(st.customer_address)
+                FROM service_tickets st
+                LEFT JOIN customers c ON c.phone <=> st.customer_phone AND c.name <=> st.customer_name
+                WHERE st.id BETWEEN %s AND %s AND st.customer_id IS NULL AND c.id IS NULL
+                GROUP BY st.customer_name, st.customer_phone
+            """, (start, end))
+            # Earliest customer per (name, phone), in case the table already had duplicates
+            cursor.execute("""
+                UPDATE service_tickets st
+                SET st.customer_id = (
+                    SELECT MIN(c.id) FROM customers c
+                    WHERE c.phone <=> st.customer_phone AND c.name <=> st.customer_name
+                )
+                WHERE st.id BETWEEN %s AND %s AND st.customer_id IS NULL
+            """, (start, end))
+            cursor.connection.commit()
+
+def index_tickets_by_assignee(cursor):
+    # get_technician_tickets: WHERE assigned_staff_id = ? [AND status = ?], schedule views by scheduled_date
+    if not index_exists(cursor, 'service_tickets', 'idx_tickets_assignee_status_date'):
+        online_alter(
+            cursor, 'service_tickets',
+            "ADD INDEX idx_tickets_assignee_status_date (assigned_staff_id, status, scheduled_date)"
+        )
+    if not index_exists(cursor, 'service_tickets', 'idx_tickets_customer'):
+        online_alter(cursor, 'service_tickets', "ADD INDEX idx_tickets_customer (customer_id)")
+
+def index_notifications_by_user(cursor):
+    # get_technician_notifications / unread counts: WHERE user_id = ? [AND is_read = 0] ORDER BY created_at
+    if not index_exists(cursor, 'notifications', 'idx_notifications_user_read_created'):
+        online_alter(
+            cursor, 'notifications',
+            "ADD INDEX idx_notifications_user_read_created (user_id, is_read, created_at)"
+        )
+
+def add_ticket_parts_and_photos(cursor):
+    # Ticket detail: parts used and photos, batch-loaded with WHERE ticket_id IN (...)
+    if not table_exists(cursor, 'ticket_parts'):
+        cursor.execute("""
+            CREATE TABLE ticket_parts (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                ticket_id INT NOT NULL,
+                part_id INT NULL,
+                name VARCHAR(100),
+                quantity INT DEFAULT 1,
+                cost DECIMAL(10,2),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                KEY idx_ticket_parts_ticket (ticket_id)
+            )
+        """)
+    if not table_exists(cursor, 'ticket_photos'):
+        cursor.execute("""
+            CREATE TABLE ticket_photos (
+                id INT PRIMARY KEY AUTO_INCREMENT,
+                ticket_id INT NOT NULL,
+                url VARCHAR(500),
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                KEY idx_ticket_photos_ticket (ticket_id)
+            )
+        """)
+
+def add_idempotency_keys(cursor):
+    # Shared Idempotency-Key claims/responses across workers (main.py, IDEMPOTENCY_DB=true)
+    if not table_exists(cursor, 'idempotency_keys'):
+        cursor.execute("""
+            CREATE TABLE idempotency_keys (
+                scope VARCHAR(64) NOT NULL,
+                idempotency_key VARCHAR(255) NOT NULL,
+                fingerprint CHAR(64) NOT NULL,
+                status_code SMALLINT NULL,
+                content_type VARCHAR(100) NULL,
+                body MEDIUMBLOB NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                expires_at DATETIME NOT NULL,
+                PRIMARY KEY (scope, idempotency_key),
+                KEY idx_idempotency_keys_expires (expires_at)
+            )
+        """)
+
+MIGRATIONS = [
+    (1, 'align_ticket_assignee_column', align_ticket_assignee_column),
+    (2, 'add_ticket_customers', add_ticket_customers),
+    (3, 'index_tickets_by_assignee', index_tickets_by_assignee),
+    (4, 'index_notifications_by_user', index_notifications_by_user),
+    (5, 'add_ticket_parts_and_photos', add_ticket_parts_and_photos),
+    (6, 'add_idempotency_keys', add_idempotency_keys),
+]
+
+def run_migrations(conn):
+    """Apply pending MIGRATIONS in order; returns the number applied."""
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Serialise concurrent runners (e.g. several instances deploying at once)
+    cursor.execute("SELECT GET_LOCK('ostrich_schema_migrations', 300)")
+    if cursor.fetchone()[0] != 1:
+        cursor.close()
+        raise RuntimeError("Could not acquire the schema migration lock")
+    applied = 0
+    try:
+        cursor.execute("SELECT version FROM schema_version")
+        done = {row[0] for row in cursor.fetchall()}
+        for version, name, up in MIGRATIONS:
+            if version in done:
+                print(f"PASS: Migration {version} ({name}) already applied")
+                continue
+            print(f"Applying migration {version}: {name}")
+            up(cursor)
+            cursor.execute("INSERT INTO schema_version (version, name) VALUES (%s, %s)", (version, name))
+            conn.commit()
+            applied += 1
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK('ostrich_schema_migrations')")
+        cursor.fetchall()
+        cursor.close()
+    return applied
+
+def migrate():
+    print("Connecting to Aiven MySQL database...")
+    try:
+        conn = pymysql.connect(**DB_CONFIG)
+        applied = run_migrations(conn)
+        conn.close()
+        print(f"PASS: Schema up to date ({applied} migrations applied)")
+        return True
+    except Exception as e:
+        print(f"FAIL: Migration failed: {e}")
+        return False
+
 def check_and_setup_tables():
     print("Connecting to Aiven MySQL database...")
     
@@ -26,73 +333,18 @@ def check_and_setup_tables():
         existing_tables = [table[0] for table in cursor.fetchall()]
         print(f"Existing tables: {existing_tables}")
         
-        # Required tables for service API
-        required_tables = {
-            'technicians': """
-                CREATE TABLE technicians (
-                    id INT PRIMARY KEY AUTO_INCREMENT,
-                    employee_id VARCHAR(50) UNIQUE,
-                    full_name VARCHAR(100),
-                    email VARCHAR(100),
-                    phone VARCHAR(20),
-                    role VARCHAR(50) DEFAULT 'technician',
-                    specializations JSON,
-                    experience_years INT DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """,
-            'service_tickets': """
-                CREATE TABLE service_tickets (
-                    id INT PRIMARY KEY AUTO_INCREMENT,
-                    ticket_number VARCHAR(50) UNIQUE,
-                    customer_name VARCHAR(100),
-                    customer_phone VARCHAR(20),
-                    customer_address TEXT,
-                    product_name VARCHAR(100),
-                    product_model VARCHAR(50),
-                    issue_description TEXT,
-                    status ENUM('SCHEDULED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED') DEFAULT 'SCHEDULED',
-                    priority ENUM('LOW', 'MEDIUM', 'HIGH', 'URGENT') DEFAULT 'MEDIUM',
-                    assigned_technician_id INT,
-                    scheduled_date DATETIME,
-                    completed_at DATETIME NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """,
-            'notifications': """
-                CREATE TABLE notifications (
-                    id INT PRIMARY KEY AUTO_INCREMENT,
-                    user_id INT,
-                    title VARCHAR(200),
-                    message TEXT,
-                    type VARCHAR(50),
-                    is_read BOOLEAN DEFAULT FALSE,
-                    ticket_id INT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """,
-            'inventory': """
-                CREATE TABLE inventory (
-                    id INT PRIMARY KEY AUTO_INCREMENT,
-                    part_number VARCHAR(50) UNIQUE,
-                    name VARCHAR(100),
-                    category VARCHAR(50),
-                    quantity_available INT DEFAULT 0,
-                    unit_cost DECIMAL(10,2),
-                    location VARCHAR(100),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """
-        }
-        
         # Create missing tables
-        for table_name, create_sql in required_tables.items():
+        for table_name, create_sql in REQUIRED_TABLES.items():
             if table_name not in existing_tables:
                 print(f"Creating table: {table_name}")
                 cursor.execute(create_sql)
             else:
                 print(f"PASS: Table {table_name} already exists")
         
+        # Bring the schema up to date (column names, customers, indexes)
+        print("Running schema migrations...")
+        run_migrations(conn)
+        
         # Insert sample data
         print("Inserting sample data...")
         
@@ -104,12 +356,20 @@ def check_and_setup_tables():
             ('EMP003', 'Bob Service', 'bob.tech@ostrich.com', '9876543222', '["Motors", "Generators"]', 7)
         """)
         
+        # Sample customers
+        cursor.execute("""
+            INSERT IGNORE INTO customers (id, name, phone, address) VALUES
+            (1, 'John Customer', '9876543210', '123 Main St, Mumbai'),
+            (2, 'Jane Smith', '9876543211', '456 Service Ave, Delhi'),
+            (3, 'Bob Wilson', '9876543212', '789 Repair Rd, Bangalore')
+        """)
+        
         # Sample tickets
         cursor.execute("""
-            INSERT IGNORE INTO service_tickets (ticket_number, customer_name, customer_phone, customer_address, product_name, product_model, issue_description, status, priority, assigned_technician_id, scheduled_date) VALUES
-            ('TKT000001', 'John Customer', '9876543210', '123 Main St, Mumbai', '3HP Motor', 'OST-3HP-SP', 'Motor not starting properly', 'SCHEDULED', 'HIGH', 1, '2025-01-15 09:00:00'),
-            ('TKT000002', 'Jane Smith', '9876543211', '456 Service Ave, Delhi', '5HP Pump', 'OST-5HP-MP', 'Pump maintenance required', 'IN_PROGRESS', 'MEDIUM', 1, '2025-01-15 14:00:00'),
-            ('TKT000003', 'Bob Wilson', '9876543212', '789 Repair Rd, Bangalore', '7HP Generator', 'OST-7HP-GN', 'Generator overheating issue', 'COMPLETED', 'HIGH', 2, '2025-01-14 11:00:00')
+            INSERT IGNORE INTO service_tickets (ticket_number, customer_id, customer_name, customer_phone, customer_address, product_name, product_model, issue_description, status, priority, assigned_staff_id, scheduled_date) VALUES
+            ('TKT000001', 1, 'John Customer', '9876543210', '123 Main St, Mumbai', '3HP Motor', 'OST-3HP-SP', 'Motor not starting properly', 'SCHEDULED', 'HIGH', 1, '2025-01-15 09:00:00'),
+            ('TKT000002', 2, 'Jane Smith', '9876543211', '456 Service Ave, Delhi', '5HP Pump', 'OST-5HP-MP', 'Pump maintenance required', 'IN_PROGRESS', 'MEDIUM', 1, '2025-01-15 14:00:00'),
+            ('TKT000003', 3, 'Bob Wilson', '9876543212', '789 Repair Rd, Bangalore', '7HP Generator', 'OST-7HP-GN', 'Generator overheating issue', 'COMPLETED', 'HIGH', 2, '2025-01-14 11:00:00')
         """)
         
         # Sample notifications
@@ -141,4 +401,6 @@ def check_and_setup_tables():
         return False
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "migrate":
+        sys.exit(0 if migrate() else 1)
     check_and_setup_tables()
\ No newline at end of file
@@ -0,0 +1,54 @@
+import pymysql
+import pytest
+
+import fakedb
+import main
+from circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def half_open_breaker(monkeypatch, tmp_path):
+    """main.db_breaker swapped for one that is half-open with a single trial slot."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now = 31
+    monkeypatch.setattr(main, 'db_breaker', breaker)
+    db_path = str(tmp_path / 'breaker.db')
+    monkeypatch.setattr(main.connection_pool, '_connect', lambda **kwargs: fakedb.connect(db_path))
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    return breaker
+
+
+def test_server_error_in_half_open_trial_closes_circuit(half_open_breaker):
+    # A deadlock is answered by the server, so the trial proves it is reachable
+    with pytest.raises(pymysql.err.OperationalError):
+        with main.get_db_connection() as conn:
+            assert conn is not None
+            raise pymysql.err.OperationalError(1213, 'Deadlock found when trying to get lock')
+    assert half_open_breaker.state == CircuitBreaker.CLOSED
+    with main.get_db_connection() as conn:
+        assert conn is not None
+
+
+def test_connection_loss_in_half_open_trial_reopens_circuit(half_open_breaker):
+    with pytest.raises(pymysql.err.OperationalError):
+        with main.get_db_connection() as conn:
+            raise pymysql.err.OperationalError(2013, 'Lost connection to MySQL server during query')
+    assert half_open_breaker.state == CircuitBreaker.OPEN
+
+
+def test_interrupted_trial_gives_back_its_slot(half_open_breaker):
+    with pytest.raises(KeyboardInterrupt):
+        with main.get_db_connection():
+            raise KeyboardInterrupt
+    assert half_open_breaker.state == CircuitBreaker.HALF_OPEN
+    assert half_open_breaker.allow()